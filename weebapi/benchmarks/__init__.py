@@ -0,0 +1,12 @@
+"""
+Offline benchmark suite for the Weeb API.
+
+Runs against a dedicated local SQLite database seeded with synthetic data
+(see `benchmarks.settings`), and writes machine-readable JSON results that
+can be compared between commits.
+
+Usage (from the `weebapi` directory):
+    python -m benchmarks --output results.json
+    python -m benchmarks --only inference blog --posts 10000 100000
+    python -m benchmarks --compare before.json after.json
+"""
@@ -0,0 +1,112 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+
+
+SUITES = ("inference", "contact", "blog")
+
+
+def git_commit():
+    """Return the current git commit, or None outside of a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(before_path, after_path):
+    """Print the p50 change of every benchmark present in both files."""
+    def load(path):
+        with open(path) as f:
+            results = json.load(f)["results"]
+        return {(r["name"], json.dumps(r["params"], sort_keys=True)): r
+                for r in results}
+
+    before, after = load(before_path), load(after_path)
+    for key in sorted(before.keys() & after.keys()):
+        old, new = before[key]["p50_ms"], after[key]["p50_ms"]
+        change = (new - old) / old * 100 if old else 0.0
+        print(f"{key[0]:28} {key[1]:40} {old:10.3f}ms -> {new:10.3f}ms "
+              f"({change:+.1f}%)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Offline benchmarks of inference, contact creation and "
+                    "blog endpoints.",
+    )
+    parser.add_argument("--only", nargs="+", choices=SUITES, default=SUITES,
+                        help="Suites to run (default: all).")
+    parser.add_argument("--posts", nargs="+", type=int,
+                        default=[10_000, 100_000, 1_000_000],
+                        help="Post table sizes for the blog suite.")
+    parser.add_argument("--content-words", type=int, default=150,
+                        help="Words per synthetic post body.")
+    parser.add_argument("--repeat", type=int, default=100,
+                        help="Measured calls per benchmark.")
+    parser.add_argument("--fresh", action="store_true",
+                        help="Delete the benchmark database first.")
+    parser.add_argument("--output", default=None,
+                        help="Write JSON results to this file.")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"),
+                        help="Compare two result files and exit.")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "benchmarks.settings")
+    import django
+    from django.conf import settings
+    from django.core.management import call_command
+
+    django.setup()
+    database = settings.DATABASES["default"]["NAME"]
+    if args.fresh and os.path.exists(database):
+        os.remove(database)
+    call_command("migrate", verbosity=0)
+
+    from . import suites
+
+    results = []
+    if "inference" in args.only:
+        results += suites.bench_inference(args.repeat)
+    if "contact" in args.only:
+        results += suites.bench_contacts(args.repeat)
+    if "blog" in args.only:
+        results += suites.bench_blog(args.posts, args.repeat,
+                                     args.content_words)
+
+    for entry in results:
+        size = f" {entry['bytes']:>9}B" if "bytes" in entry else ""
+        print(f"{entry['name']:28} {json.dumps(entry['params']):40} "
+              f"p50={entry['p50_ms']:9.3f}ms p99={entry['p99_ms']:9.3f}ms"
+              f"{size}")
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "date": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "database": str(database),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
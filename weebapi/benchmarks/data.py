@@ -0,0 +1,91 @@
+import random
+
+from django.utils.text import slugify
+
+
+WORDS = (
+    "anime manga episode season character story studio opening ending "
+    "review recommend watch read chapter arc hero villain friend battle "
+    "school romance comedy drama fantasy mecha music art animation voice "
+    "actor fan community release trailer adaptation novel volume series "
+    "great amazing awful boring beautiful classic favorite underrated "
+    "overrated long short new old best worst strong weak dark bright fun "
+    "sad happy exciting slow fast simple complex original sequel movie "
+    "the a of and to in is it that for on with as this was but are be "
+    "have not they at one all by from or so what about more when time"
+).split()
+
+AUTHORS = ["Alice", "Bob", "Chloé", "David", "Emma", "Farid", "Gaëlle",
+           "Hugo", "Inès", "Jules", "Anonyme"]
+
+
+def sentence(rng, words):
+    """Return a random sentence of `words` words."""
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def messages(count, words, seed=0):
+    """Return `count` synthetic messages of `words` words each."""
+    rng = random.Random(seed)
+    return [sentence(rng, words) for _ in range(count)]
+
+
+def contact_payloads(count, seed=0):
+    """Return `count` valid request bodies for `POST /api/contact/`."""
+    rng = random.Random(seed)
+    return [
+        {
+            "first_name": rng.choice(AUTHORS),
+            "last_name": "Bench",
+            "phone_number": f"+336{rng.randrange(10 ** 8):08d}",
+            "email_address": f"bench{i}@example.com",
+            "message": sentence(rng, rng.randint(5, 40)),
+        }
+        for i in range(count)
+    ]
+
+
+def seed_posts(target, content_words=150, batch_size=5000, seed=0):
+    """Grow the `Post` table to `target` rows with synthetic posts.
+
+    Posts are inserted with `bulk_create` and pre-computed unique slugs, so
+    seeding does not go through `Post.save()`; the search index is rebuilt
+    afterwards. Existing rows are kept, which lets the suite seed
+    incrementally for each table size.
+
+    Args:
+        target (int): Number of posts wanted in the table.
+        content_words (int): Words per post body.
+        batch_size (int): Rows per `bulk_create` call.
+        seed (int): Random seed.
+
+    Returns:
+        int: The number of posts created.
+    """
+    from blog.models import Post, normalize_author
+    from blog.search import is_available, rebuild_index
+
+    existing = Post.objects.count()
+    rng = random.Random(seed + existing)
+    created = 0
+    while existing + created < target:
+        count = min(batch_size, target - existing - created)
+        posts = []
+        for i in range(existing + created, existing + created + count):
+            title = sentence(rng, rng.randint(3, 8))
+            author = rng.choice(AUTHORS)
+            posts.append(Post(
+                title=title,
+                slug=f"{slugify(title)[:200]}-{i}",
+                excerpt=sentence(rng, 20),
+                content=sentence(rng, content_words),
+                author=author,
+                author_key=normalize_author(author),
+                is_published=rng.random() < 0.9,
+            ))
+        Post.objects.bulk_create(posts)
+        created += count
+    if created and is_available():
+        # bulk_create does not send the signals that maintain the index
+        rebuild_index()
+    return created
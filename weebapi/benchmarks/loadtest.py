@@ -0,0 +1,511 @@
+"""
+Closed-loop load generator for the API, used by the `loadtest` command.
+
+A fixed number of concurrent clients send requests back to back, each
+picking the kind of request at random according to the mix, until the
+request budget or the duration is spent. Requests go to one of three
+targets, none of which needs anything beyond the standard library and
+localhost:
+
+- "wsgi": `core.wsgi.application`, called in-process from client threads.
+- "asgi": `core.asgi.application`, driven in-process by asyncio tasks.
+- "http": a server already listening on a local URL (e.g. `runserver`,
+  gunicorn or uvicorn), over keep-alive HTTP/1.1 connections.
+"""
+import asyncio
+import http.client
+import io
+import json
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from asgiref.sync import async_to_sync
+
+from .data import AUTHORS, contact_payloads, sentence
+from .runner import percentile
+
+
+# Kinds of requests, and their default share of the traffic
+KINDS = ("satisfaction", "contact", "list", "detail")
+DEFAULT_MIX = "satisfaction=1,contact=1,list=4,detail=4"
+
+# Host header sent to the in-process applications
+HOST = "localhost"
+# Only the first pages of the list are requested, like real traffic
+MAX_LIST_PAGE = 20
+
+
+def parse_mix(value):
+    """Parse a request mix such as "list=4,detail=4,contact=1".
+
+    Args:
+        value (str): Comma-separated `kind=weight` pairs; kinds left out
+            are not requested.
+
+    Returns:
+        dict[str, float]: Weight by kind.
+
+    Raises:
+        ValueError: On an unknown kind or an invalid weight.
+    """
+    mix = {}
+    for item in value.split(","):
+        kind, _, weight = item.strip().partition("=")
+        if kind not in KINDS:
+            raise ValueError(f"Unknown request kind {kind!r} (expected "
+                             f"{', '.join(KINDS)}).")
+        try:
+            mix[kind] = float(weight)
+        except ValueError:
+            raise ValueError(f"Invalid weight for {kind!r}: {weight!r}.")
+        if mix[kind] < 0:
+            raise ValueError(f"Negative weight for {kind!r}.")
+    if not any(mix.values()):
+        raise ValueError("The request mix is empty.")
+    return mix
+
+
+def parse_server_timing(value):
+    """Return the durations (ms) of a `Server-Timing` header by name."""
+    timings = {}
+    for entry in (value or "").split(","):
+        name, *params = entry.strip().split(";")
+        for param in params:
+            key, _, duration = param.partition("=")
+            if key == "dur":
+                timings[name] = float(duration)
+    return timings
+
+
+class Response:
+    """Status, `Server-Timing` header and body of a load test response."""
+
+    __slots__ = ("status", "server_timing", "body")
+
+    def __init__(self, status, server_timing, body):
+        self.status = status
+        self.server_timing = server_timing
+        self.body = body
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class WSGITarget:
+    """Calls a WSGI application in-process.
+
+    Args:
+        application (callable): The WSGI application.
+    """
+
+    name = "wsgi"
+
+    def __init__(self, application):
+        self.application = application
+
+    def request(self, method, path, body=None):
+        """Send one request and return its `Response`."""
+        path, _, query = path.partition("?")
+        body = b"" if body is None else json.dumps(body).encode()
+        environ = {
+            "REQUEST_METHOD": method,
+            "PATH_INFO": path,
+            "QUERY_STRING": query,
+            "SERVER_NAME": HOST,
+            "SERVER_PORT": "80",
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "REMOTE_ADDR": "127.0.0.1",
+            "HTTP_HOST": HOST,
+            "HTTP_ACCEPT": "application/json",
+            "CONTENT_TYPE": "application/json",
+            "CONTENT_LENGTH": str(len(body)),
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": "http",
+            "wsgi.input": io.BytesIO(body),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        started = {}
+
+        def start_response(status, headers, exc_info=None):
+            started["status"] = int(status.split(" ", 1)[0])
+            started["headers"] = headers
+
+        result = self.application(environ, start_response)
+        try:
+            content = b"".join(result)
+        finally:
+            # Sends request_finished, like a WSGI server would
+            if hasattr(result, "close"):
+                result.close()
+        timing = next((value for name, value in started["headers"]
+                       if name.lower() == "server-timing"), None)
+        return Response(started["status"], timing, content)
+
+
+class ASGITarget:
+    """Calls an ASGI application in-process.
+
+    Args:
+        application (callable): The ASGI application.
+    """
+
+    name = "asgi"
+
+    def __init__(self, application):
+        self.application = application
+
+    async def arequest(self, method, path, body=None):
+        """Send one request and return its `Response`."""
+        path, _, query = path.partition("?")
+        body = b"" if body is None else json.dumps(body).encode()
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": [
+                (b"host", HOST.encode()),
+                (b"accept", b"application/json"),
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+            "client": ("127.0.0.1", 0),
+            "server": (HOST, 80),
+        }
+        request_sent = False
+        response = {"headers": [], "body": []}
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body,
+                        "more_body": False}
+            # The client never disconnects; Django cancels this wait once
+            # the response is sent
+            await asyncio.Future()
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = message.get("headers", [])
+            elif message["type"] == "http.response.body":
+                response["body"].append(message.get("body", b""))
+
+        await self.application(scope, receive, send)
+        timing = next((value.decode() for name, value in response["headers"]
+                       if name.lower() == b"server-timing"), None)
+        return Response(response["status"], timing,
+                        b"".join(response["body"]))
+
+    def request(self, method, path, body=None):
+        """Synchronous `arequest`, used for seeding."""
+        return async_to_sync(self.arequest)(method, path, body)
+
+
+class HTTPTarget:
+    """Sends requests to a running server, one connection per thread.
+
+    Args:
+        url (str): Base URL of the server, e.g. "http://127.0.0.1:8000".
+    """
+
+    name = "http"
+
+    def __init__(self, url):
+        parts = urlsplit(url)
+        if parts.scheme != "http" or not parts.hostname:
+            raise ValueError(f"Expected an http:// URL, got {url!r}.")
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip("/")
+        self._local = threading.local()
+
+    def request(self, method, path, body=None):
+        """Send one request and return its `Response`."""
+        body = None if body is None else json.dumps(body).encode()
+        headers = {"Accept": "application/json"}
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+        for attempt in range(2):
+            connection = getattr(self._local, "connection", None)
+            if connection is None:
+                connection = self._local.connection = (
+                    http.client.HTTPConnection(self.host, self.port,
+                                               timeout=60)
+                )
+            try:
+                connection.request(method, self.prefix + path, body, headers)
+                response = connection.getresponse()
+                content = response.read()
+            except (ConnectionError, http.client.HTTPException):
+                # The server closed the kept-alive connection: retry once
+                # on a new one
+                connection.close()
+                self._local.connection = None
+                if attempt:
+                    raise
+                continue
+            if response.getheader("Connection", "").lower() == "close":
+                connection.close()
+                self._local.connection = None
+            return Response(response.status,
+                            response.getheader("Server-Timing"), content)
+
+
+def seed(target, posts, seed=0):
+    """Create published posts through the API until there are `posts`.
+
+    Args:
+        target: The target to seed.
+        posts (int): Number of published posts wanted.
+        seed (int): Random seed.
+
+    Returns:
+        tuple[int, list[str], int]: The number of posts created, slugs of
+        posts to request in detail, and the number of list pages.
+
+    Raises:
+        RuntimeError: If the API does not answer as expected.
+    """
+    rng = random.Random(seed)
+    page = _get_json(target, "/api/posts/?fields=slug")
+    created = 0
+    slugs = [post["slug"] for post in page["results"]]
+    for _ in range(max(0, posts - page["count"])):
+        title = sentence(rng, rng.randint(3, 8))
+        response = target.request("POST", "/api/posts/", {
+            "title": title,
+            "excerpt": sentence(rng, 20),
+            "content": sentence(rng, 150),
+            "author": rng.choice(AUTHORS),
+            "is_published": True,
+        })
+        if response.status != 201:
+            raise RuntimeError(f"Creating a post failed with "
+                               f"{response.status}: {response.body[:200]!r}")
+        slugs.append(response.json()["slug"])
+        created += 1
+
+    page = _get_json(target, "/api/posts/?fields=slug")
+    page_size = max(1, len(page["results"]))
+    pages = max(1, -(-page["count"] // page_size))
+    for number in range(2, min(pages, MAX_LIST_PAGE) + 1):
+        page = _get_json(target, f"/api/posts/?fields=slug&page={number}")
+        slugs.extend(post["slug"] for post in page["results"])
+    return created, sorted(set(slugs)), pages
+
+
+def _get_json(target, path):
+    """GET `path` and decode the JSON body, which must be a 200."""
+    response = target.request("GET", path)
+    if response.status != 200:
+        raise RuntimeError(f"GET {path} failed with {response.status}: "
+                           f"{response.body[:200]!r}")
+    return response.json()
+
+
+class RequestFactory:
+    """Builds random requests of each kind.
+
+    Args:
+        mix (dict[str, float]): Weight by kind.
+        slugs (list[str]): Posts to request in detail.
+        pages (int): Number of pages of the post list.
+    """
+
+    def __init__(self, mix, slugs, pages):
+        self.kinds = [kind for kind, weight in mix.items() if weight]
+        self.weights = [mix[kind] for kind in self.kinds]
+        self.slugs = slugs
+        self.pages = min(pages, MAX_LIST_PAGE)
+        if "detail" in self.kinds and not slugs:
+            raise ValueError("'detail' requests need posts; seed some "
+                             "with --posts.")
+
+    def build(self, rng):
+        """Return a random `(kind, method, path, body)` request."""
+        kind = rng.choices(self.kinds, self.weights)[0]
+        if kind == "satisfaction":
+            return (kind, "POST", "/api/satisfaction/",
+                    {"message": sentence(rng, rng.randint(5, 40))})
+        if kind == "contact":
+            payload = contact_payloads(1, seed=rng.randrange(2 ** 32))[0]
+            return kind, "POST", "/api/contact/", payload
+        if kind == "list":
+            return (kind, "GET",
+                    f"/api/posts/?page={rng.randint(1, self.pages)}", None)
+        return (kind, "GET", f"/api/posts/{rng.choice(self.slugs)}/",
+                None)
+
+
+class Budget:
+    """Hands out request slots until `requests` are taken or `duration`
+    seconds have passed (whichever is set)."""
+
+    def __init__(self, requests=None, duration=None):
+        self.remaining = requests
+        self.deadline = (time.perf_counter() + duration
+                         if duration is not None else None)
+        self._lock = threading.Lock()
+
+    def take(self):
+        """Return True if another request may be sent."""
+        if self.deadline is not None:
+            return time.perf_counter() < self.deadline
+        with self._lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+
+class Sample:
+    """Outcome of one request."""
+
+    __slots__ = ("kind", "latency", "status", "error", "timings")
+
+    def __init__(self, kind, latency, status, error, timings):
+        self.kind = kind
+        self.latency = latency
+        self.status = status
+        self.error = error
+        self.timings = timings
+
+
+def _record(kind, started, response=None, error=None):
+    """Build the `Sample` of a request started at `started`."""
+    latency = time.perf_counter() - started
+    if error is not None:
+        return Sample(kind, latency, None, type(error).__name__, {})
+    failed = response.status >= 400
+    return Sample(kind, latency, response.status,
+                  f"HTTP {response.status}" if failed else None,
+                  parse_server_timing(response.server_timing))
+
+
+def run(target, factory, concurrency, budget, seed=0):
+    """Run the load test and return the samples and the wall time.
+
+    Args:
+        target: A `WSGITarget`, `ASGITarget` or `HTTPTarget`.
+        factory (RequestFactory): Builds the requests.
+        concurrency (int): Number of concurrent clients.
+        budget (Budget): When to stop.
+        seed (int): Random seed; each client gets its own generator.
+
+    Returns:
+        tuple[list[Sample], float]: Every request's outcome and the elapsed
+        seconds.
+    """
+    started = time.perf_counter()
+    if isinstance(target, ASGITarget):
+        samples = asyncio.run(_run_async(target, factory, concurrency,
+                                         budget, seed))
+    else:
+        with ThreadPoolExecutor(concurrency,
+                                thread_name_prefix="loadtest") as pool:
+            futures = [pool.submit(_client, target, factory, budget,
+                                   random.Random(seed + index))
+                       for index in range(concurrency)]
+            samples = [sample for future in futures
+                       for sample in future.result()]
+    return samples, time.perf_counter() - started
+
+
+def _client(target, factory, budget, rng):
+    """Send requests back to back from one thread."""
+    samples = []
+    while budget.take():
+        kind, method, path, body = factory.build(rng)
+        started = time.perf_counter()
+        try:
+            response = target.request(method, path, body)
+        except Exception as e:
+            samples.append(_record(kind, started, error=e))
+        else:
+            samples.append(_record(kind, started, response))
+    return samples
+
+
+async def _run_async(target, factory, concurrency, budget, seed):
+    """Run the asyncio clients of an ASGI load test."""
+    async def client(rng):
+        samples = []
+        while budget.take():
+            kind, method, path, body = factory.build(rng)
+            started = time.perf_counter()
+            try:
+                response = await target.arequest(method, path, body)
+            except Exception as e:
+                samples.append(_record(kind, started, error=e))
+            else:
+                samples.append(_record(kind, started, response))
+        return samples
+
+    results = await asyncio.gather(*(client(random.Random(seed + index))
+                                     for index in range(concurrency)))
+    return [sample for samples in results for sample in samples]
+
+
+def report(samples, elapsed):
+    """Summarize the samples, per kind of request and overall.
+
+    Args:
+        samples (list[Sample]): Outcomes of the measured requests.
+        elapsed (float): Wall time of the run, in seconds.
+
+    Returns:
+        list[dict]: One entry per kind (in `KINDS` order), then "all", with
+        the number of requests and errors, the error rate, the throughput,
+        latency percentiles in milliseconds, the mean `Server-Timing`
+        durations and the most frequent errors.
+    """
+    groups = {}
+    for sample in samples:
+        groups.setdefault(sample.kind, []).append(sample)
+    ordered = [(kind, groups[kind]) for kind in KINDS if kind in groups]
+    if samples:
+        ordered.append(("all", samples))
+
+    rows = []
+    for kind, group in ordered:
+        latencies = sorted(sample.latency for sample in group)
+        errors = {}
+        for sample in group:
+            if sample.error:
+                errors[sample.error] = errors.get(sample.error, 0) + 1
+        server_timing = {}
+        for sample in group:
+            for name, duration in sample.timings.items():
+                server_timing[name] = server_timing.get(name, 0) + duration
+        rows.append({
+            "kind": kind,
+            "requests": len(group),
+            "errors": sum(errors.values()),
+            "error_rate": sum(errors.values()) / len(group),
+            "throughput": len(group) / elapsed if elapsed else None,
+            "mean_ms": sum(latencies) / len(latencies) * 1000,
+            "p50_ms": percentile(latencies, 0.50) * 1000,
+            "p90_ms": percentile(latencies, 0.90) * 1000,
+            "p95_ms": percentile(latencies, 0.95) * 1000,
+            "p99_ms": percentile(latencies, 0.99) * 1000,
+            "max_ms": latencies[-1] * 1000,
+            "server_timing_ms": {name: total / len(group)
+                                 for name, total in server_timing.items()},
+            "error_counts": dict(sorted(errors.items(),
+                                        key=lambda item: -item[1])),
+        })
+    return rows
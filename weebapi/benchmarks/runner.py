@@ -0,0 +1,70 @@
+import time
+
+
+def percentile(sorted_values, fraction):
+    """Return the nearest-rank percentile of an already sorted list."""
+    index = min(len(sorted_values) - 1,
+                max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(timings):
+    """Summarize a list of durations (in seconds).
+
+    Args:
+        timings (list[float]): Measured durations.
+
+    Returns:
+        dict: Count, mean/min/max and p50/p90/p99 in milliseconds, and
+        operations per second.
+    """
+    values = sorted(timings)
+    total = sum(values)
+    return {
+        "count": len(values),
+        "mean_ms": total / len(values) * 1000,
+        "min_ms": values[0] * 1000,
+        "p50_ms": percentile(values, 0.50) * 1000,
+        "p90_ms": percentile(values, 0.90) * 1000,
+        "p99_ms": percentile(values, 0.99) * 1000,
+        "max_ms": values[-1] * 1000,
+        "ops_per_s": len(values) / total if total else None,
+    }
+
+
+def measure(func, repeat, warmup=3):
+    """Time repeated calls of `func`.
+
+    Args:
+        func (callable): Called with the call index. Measured calls get
+            indices `0..repeat - 1` and warmup calls the `warmup` indices
+            after them, so inputs used for warmup are never measured.
+        repeat (int): Number of measured calls.
+        warmup (int): Number of unmeasured calls made first.
+
+    Returns:
+        dict: The summary returned by `summarize`.
+    """
+    for i in range(repeat, repeat + warmup):
+        func(i)
+    timings = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        func(i)
+        timings.append(time.perf_counter() - start)
+    return summarize(timings)
+
+
+def result(name, params, stats, **extra):
+    """Build one entry of the JSON results.
+
+    Args:
+        name (str): Benchmark name, e.g. "blog.list".
+        params (dict): Parameters that identify the measurement.
+        stats (dict): Output of `measure` or `summarize`.
+        **extra: Additional values to record.
+
+    Returns:
+        dict: The result entry.
+    """
+    return {"name": name, "params": params, **stats, **extra}
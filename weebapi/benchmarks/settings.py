@@ -0,0 +1,27 @@
+"""
+Django settings for the benchmark suite.
+
+Same as `core.settings`, but with a separate SQLite database (so the
+development database is never touched) and with DEBUG disabled, so that
+Django does not record every executed query. The blog response cache is
+disabled, so that the blog cases measure the queries and serialization;
+the cached cases turn it on explicitly.
+"""
+import os
+
+from core.settings import *  # noqa: F401,F403
+from core.settings import BASE_DIR
+
+DEBUG = False
+
+ALLOWED_HOSTS = ["localhost", "127.0.0.1", "testserver"]
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.environ.get("BENCHMARK_DB",
+                               BASE_DIR / "benchmark.sqlite3"),
+    }
+}
+
+BLOG_RESPONSE_CACHE = False
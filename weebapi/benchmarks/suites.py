@@ -0,0 +1,116 @@
+import random
+
+from django.test import Client
+from django.test.utils import override_settings
+
+from . import data
+from .runner import measure, result
+
+
+def bench_inference(repeat, lengths=(5, 20, 100), batch_sizes=(10, 100, 1000)):
+    """Single and batched sentiment inference at several message lengths.
+
+    Every call scores messages that were never seen before, so the
+    prediction cache does not hide the model cost.
+    """
+    from satisfaction.satisfaction import (
+        analyze_satisfaction,
+        analyze_satisfaction_many,
+        get_model,
+    )
+
+    get_model()  # Do not measure model loading
+    results = []
+    for words in lengths:
+        messages = data.messages(repeat + 3, words, seed=words)
+        stats = measure(lambda i: analyze_satisfaction(messages[i]), repeat)
+        results.append(result("inference.single", {"words": words}, stats))
+
+        for size in batch_sizes:
+            rounds = max(1, repeat // 10)
+            batches = [data.messages(size, words, seed=f"{words}-{size}-{i}")
+                       for i in range(rounds + 3)]
+            stats = measure(lambda i: analyze_satisfaction_many(batches[i]),
+                            rounds)
+            results.append(result(
+                "inference.batch", {"words": words, "batch_size": size},
+                stats,
+                messages_per_s=size * stats["ops_per_s"],
+            ))
+    return results
+
+
+def bench_contacts(repeat):
+    """Throughput of `POST /api/contact/`, including sentiment scoring."""
+    client = Client()
+    payloads = data.contact_payloads(repeat + 3, seed=random.randrange(10 ** 6))
+
+    def create(i):
+        response = client.post("/api/contact/", payloads[i],
+                               content_type="application/json")
+        assert response.status_code == 201, response.content
+
+    return [result("contact.create", {}, measure(create, repeat))]
+
+
+def bench_blog(sizes, repeat, content_words=150):
+    """List, search and detail latency of the blog endpoints.
+
+    For each table size, the `Post` table is grown to that size, then every
+    endpoint is measured on it. Each result also records the size of the
+    response body, in `bytes`.
+    """
+    from blog.models import Post
+    from blog.serializers import PostSerializer
+
+    client = Client()
+    results = []
+    for size in sorted(sizes):
+        data.seed_posts(size, content_words=content_words)
+        published = Post.objects.filter(is_published=True)
+        pages = max(1, published.count() // 6)
+        slugs = list(Post.objects.order_by("?")
+                     .values_list("slug", flat=True)[:repeat + 3])
+
+        # Size of the last response of each case
+        last = {}
+
+        def get(path, status=200, **headers):
+            def request(i):
+                url = path(i) if callable(path) else path
+                response = client.get(url, headers=headers)
+                assert response.status_code == status, response.content
+                last["bytes"] = len(response.content)
+            return request
+
+        cases = [
+            ("blog.list", "/api/posts/"),
+            ("blog.list_deep_page", f"/api/posts/?page={max(1, pages // 2)}"),
+            ("blog.list_with_content", "/api/posts/?fields=" + ",".join(
+                PostSerializer.Meta.fields)),
+            ("blog.list_title_only", "/api/posts/?fields=url,title,excerpt"),
+            ("blog.list_cursor", "/api/posts/?pagination=cursor"),
+            ("blog.list_oldest_first", "/api/posts/?ordering=created_at"),
+            ("blog.search", "/api/posts/?q=villain"),
+            ("blog.search_rare", "/api/posts/?q=nonexistentword"),
+            ("blog.author", "/api/posts/?author=Chlo"),
+            ("blog.detail", lambda i: f"/api/posts/{slugs[i % len(slugs)]}/"),
+        ]
+        for name, path in cases:
+            results.append(result(name, {"posts": size},
+                                  measure(get(path), repeat), **last))
+
+        # Same endpoints served from the response cache (filled by the
+        # warmup calls), and answered with a 304 from the ETag
+        with override_settings(BLOG_RESPONSE_CACHE=True):
+            etag = client.get("/api/posts/")["ETag"]
+            cached_cases = [
+                ("blog.list_cached", get("/api/posts/")),
+                ("blog.detail_cached", get(f"/api/posts/{slugs[0]}/")),
+                ("blog.list_not_modified",
+                 get("/api/posts/", status=304, if_none_match=etag)),
+            ]
+            for name, request in cached_cases:
+                results.append(result(name, {"posts": size},
+                                      measure(request, repeat), **last))
+    return results
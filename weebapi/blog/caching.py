@@ -0,0 +1,175 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, parse_etags
+from rest_framework.permissions import SAFE_METHODS
+
+
+# Cache entry holding the current version of the cached post responses
+VERSION_KEY = "blog:responses:version"
+
+
+def get_cache():
+    """Return the cache configured by `BLOG_RESPONSE_CACHE_ALIAS`."""
+    return caches[settings.BLOG_RESPONSE_CACHE_ALIAS]
+
+
+def get_version():
+    """Return the current version of the cached post responses.
+
+    The version is the time of the last invalidation, in microseconds. It
+    is part of every cache key and ETag, so bumping it makes every cached
+    response unreachable at once; the stale entries are then evicted by
+    the cache backend.
+
+    Returns:
+        int: The current version, created on first use.
+    """
+    cache = get_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        version = time.time_ns() // 1000
+        if not cache.add(VERSION_KEY, version, timeout=None):
+            version = cache.get(VERSION_KEY, version)
+    return version
+
+
+def invalidate_responses():
+    """Drop every cached post response by moving to a new version."""
+    cache = get_cache()
+    version = max(time.time_ns() // 1000, cache.get(VERSION_KEY, 0) + 1)
+    cache.set(VERSION_KEY, version, timeout=None)
+
+
+def is_cacheable(request):
+    """Return True if the response to `request` may be shared.
+
+    Only anonymous JSON responses are cached: the browsable API embeds the
+    user name and a CSRF token in its HTML, and authenticated users may be
+    served different content.
+    """
+    return (request.accepted_renderer.format == "json"
+            and not request.user.is_authenticated)
+
+
+def response_key(request, version):
+    """Return the cache key and strong ETag of a GET request.
+
+    Responses vary on the full URL (the serialized `url` fields are built
+    from the request host) and on the `Accept` header (JSON or browsable
+    API).
+
+    Args:
+        request (Request): The incoming request.
+        version (int): The current version (see `get_version`).
+
+    Returns:
+        tuple[str, str]: The cache key and the quoted ETag.
+    """
+    variant = "\n".join([request.build_absolute_uri(),
+                         request.META.get("HTTP_ACCEPT", "")])
+    digest = hashlib.blake2b(variant.encode(), digest_size=16).hexdigest()
+    return (f"blog:responses:{version}:{digest}",
+            f'"{version:x}-{digest}"')
+
+
+class CachedResponseMixin:
+    """
+    Cache the GET responses of a view, with conditional GET support.
+
+    Rendered 200 responses to anonymous JSON requests (see
+    `is_cacheable`) are stored in the `BLOG_RESPONSE_CACHE_ALIAS`
+    cache for `BLOG_RESPONSE_CACHE_TIMEOUT` seconds, under a key made of
+    the current version and the request variant (see `response_key`).
+    Every response gets a strong ETag and a `Last-Modified` header, and a
+    request whose `If-None-Match` matches the current ETag gets a 304
+    before the queryset or the serializer is touched. `If-None-Match: *`
+    and `If-Modified-Since` are only answered once the response is known
+    to be a 200 (from the cached entry, or after building it), so a
+    missing post still gets its 404.
+
+    The ETag is derived from the global version rather than from the
+    object's `updated_at`: the early 304 is answered without any query,
+    which a per-object ETag would need, and `updated_at` is not bumped by
+    writes that bypass `save()` (e.g. `QuerySet.update()`), while the
+    version is. The price is that any post write also changes the ETags
+    of the other posts, which costs one full response per client.
+
+    `Last-Modified` is the `updated_at` of the object when the view sets
+    `last_modified` (detail views), or else the time of the last write to
+    any post (lists).
+
+    The cache is invalidated by the `Post` save/delete signals, and by any
+    successful write request to the view, which also covers writes that
+    bypass them (e.g. `QuerySet.update()`).
+
+    The current version is kept in the same cache, so with several worker
+    processes the cache must be shared (Redis, Memcached): with the
+    per-process `LocMemCache`, a write in one process would not invalidate
+    the responses and ETags of the others. `BLOG_RESPONSE_CACHE` is off by
+    default for that reason.
+    """
+
+    # Datetime set by the view while building a response, if any
+    last_modified = None
+
+    def get(self, request, *args, **kwargs):
+        if not settings.BLOG_RESPONSE_CACHE or not is_cacheable(request):
+            return super().get(request, *args, **kwargs)
+
+        version = get_version()
+        key, etag = response_key(request, version)
+        if_none_match = parse_etags(request.META.get("HTTP_IF_NONE_MATCH", ""))
+        # `*` only matches an existing post, which is not known yet
+        if etag in if_none_match:
+            response = HttpResponseNotModified()
+            response["ETag"] = etag
+            return response
+
+        entry = get_cache().get(key)
+        if entry is None:
+            # Built normally, then stored by `finalize_response`
+            self._cache_miss = (key, etag, version)
+            return super().get(request, *args, **kwargs)
+
+        response = HttpResponse(entry["content"])
+        for header, value in entry["headers"]:
+            response[header] = value
+        return get_conditional_response(request, etag=etag,
+                                        last_modified=entry["last_modified"],
+                                        response=response)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args,
+                                             **kwargs)
+        if request.method not in SAFE_METHODS:
+            if response.status_code < 400:
+                invalidate_responses()
+            return response
+
+        miss = getattr(self, "_cache_miss", None)
+        if miss is None or response.status_code != 200:
+            return response
+
+        key, etag, version = miss
+        if self.last_modified is not None:
+            last_modified = int(self.last_modified.timestamp())
+        else:
+            last_modified = version // 1_000_000
+        response.render()
+        # Authenticated requests get their own, uncached, responses
+        patch_vary_headers(response, ("Cookie", "Authorization"))
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        get_cache().set(key, {
+            "content": response.content,
+            "headers": list(response.items()),
+            "last_modified": last_modified,
+        }, settings.BLOG_RESPONSE_CACHE_TIMEOUT)
+        return get_conditional_response(request, etag=etag,
+                                        last_modified=last_modified,
+                                        response=response)
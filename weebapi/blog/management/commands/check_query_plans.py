@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from blog.models import Post
+from blog.query_plans import CASES, page_query_plan, plan_failures
+
+
+class Command(BaseCommand):
+    """
+    Print and check the query plans of the post list endpoints.
+
+    Requests each list endpoint variant in `blog.query_plans.CASES` through
+    the test client and prints the SQLite query plan of the query fetching
+    the page of posts. Fails when that plan does not go through the
+    expected index (or, for searches, does not compute the relevance ranks
+    once), or when posts that should be read in index order are sorted in a
+    temporary B-tree instead.
+
+    The same checks run in the test suite (`blog.tests`); this command is a
+    convenience to inspect the plans against an actual database. A sample
+    post is created so that the page queries run even on an empty database;
+    it is rolled back at the end, so nothing is written.
+
+    Usage:
+        python manage.py check_query_plans
+    """
+
+    help = "Print the post list query plans; fail if they skip the indexes."
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("Query plans are only checked on SQLite.")
+
+        failures = []
+        with transaction.atomic():
+            Post.objects.create(title="Query plan check", content="-",
+                                author="Alice")
+            for path, expected, in_order in CASES:
+                status, plan = page_query_plan(path)
+                self.stdout.write(f"{path}\n" + "".join(
+                    f"    {line}\n" for line in plan
+                ))
+                failures += plan_failures(path, status, plan, expected,
+                                          in_order)
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError("Query plan regressions:\n"
+                               + "\n".join(failures))
+        self.stdout.write(self.style.SUCCESS(
+            f"All {len(CASES)} post list queries use their indexes."
+        ))
@@ -0,0 +1,72 @@
+import os
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+from blog.transfer import export_posts
+
+
+class Command(BaseCommand):
+    """
+    Export posts as NDJSON (one JSON object per line).
+
+    Posts are streamed in id order with `.iterator(chunk_size=...)`, so the
+    memory used does not depend on the number of posts. The output can be
+    loaded into another environment with `import_posts`.
+
+    Usage:
+        python manage.py export_posts --output posts.ndjson
+        python manage.py export_posts --published | gzip > posts.ndjson.gz
+    """
+
+    help = "Stream posts as NDJSON to a file or to stdout."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output", default="-",
+            help="Destination file, '-' for stdout (default: %(default)s).",
+        )
+        parser.add_argument(
+            "--chunk-size", type=int, default=2000,
+            help="Posts fetched from the database at a time "
+                 "(default: %(default)s).",
+        )
+        parser.add_argument(
+            "--published", action="store_true",
+            help="Only export published posts.",
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.all()
+        if options["published"]:
+            posts = posts.filter(is_published=True)
+        lines = export_posts(posts, chunk_size=options["chunk_size"])
+
+        started = time.perf_counter()
+        output = options["output"]
+        if output == "-":
+            count = self._write(lines, sys.stdout)
+            sys.stdout.flush()
+        else:
+            # Only replace an existing export once this one is complete
+            tmp_path = f"{output}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                count = self._write(lines, f)
+            os.replace(tmp_path, output)
+
+        elapsed = time.perf_counter() - started
+        # Reported on stderr, so that it does not mix with the NDJSON
+        self.stderr.write(self.style.SUCCESS(
+            f"Exported {count} posts in {elapsed:.1f}s "
+            f"({count / elapsed if elapsed else 0:.0f} rows/s)."
+        ))
+
+    def _write(self, lines, f):
+        """Write every line to `f` and return how many were written."""
+        count = 0
+        for line in lines:
+            f.write(line)
+            count += 1
+        return count
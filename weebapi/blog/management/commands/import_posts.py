@@ -0,0 +1,75 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.transfer import InvalidRecord, import_posts
+
+
+class Command(BaseCommand):
+    """
+    Import posts from an NDJSON file, such as one made by `export_posts`.
+
+    Lines are validated through `PostSerializer`, then inserted with
+    `bulk_create`, one transaction per batch. Slugs given in the file are
+    kept when they are free; the other posts get slugs allocated in bulk,
+    like `Post.save()` would. `created_at` and `updated_at` are kept from
+    the file. The file is read line by line, so its size does not matter.
+
+    By default the import stops at the first invalid line (the batches
+    before it stay committed); `--skip-invalid` reports and skips them.
+
+    Usage:
+        python manage.py import_posts posts.ndjson
+        gunzip -c posts.ndjson.gz | python manage.py import_posts - \\
+            --batch-size 5000 --skip-invalid
+    """
+
+    help = "Bulk import posts from an NDJSON file ('-' for stdin)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="NDJSON file, or '-' for stdin.")
+        parser.add_argument(
+            "--batch-size", type=int, default=1000,
+            help="Posts inserted per transaction (default: %(default)s).",
+        )
+        parser.add_argument(
+            "--skip-invalid", action="store_true",
+            help="Skip invalid lines instead of stopping at the first one.",
+        )
+
+    def handle(self, *args, **options):
+        if options["path"] == "-":
+            self._import(sys.stdin, options)
+        else:
+            with open(options["path"], encoding="utf-8") as f:
+                self._import(f, options)
+
+    def _import(self, lines, options):
+        started = time.perf_counter()
+        imported = skipped = 0
+        batches = import_posts(lines, batch_size=options["batch_size"],
+                               skip_invalid=options["skip_invalid"])
+        try:
+            for count, invalid in batches:
+                imported += count
+                skipped += len(invalid)
+                for record in invalid:
+                    self.stderr.write(f"Skipped {record}")
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"{imported} posts imported, {skipped} skipped, "
+                    f"{imported / elapsed if elapsed else 0:.0f} rows/s"
+                )
+        except InvalidRecord as e:
+            raise CommandError(
+                f"{e} ({imported} posts imported before it; use "
+                f"--skip-invalid to skip invalid lines)."
+            )
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {imported} posts ({skipped} skipped) in "
+            f"{elapsed:.1f}s ({imported / elapsed if elapsed else 0:.0f} "
+            f"rows/s)."
+        ))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.search import FTS_TABLE, is_available, rebuild_index
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the full-text search index of blog posts from scratch.
+
+    The index is kept up to date by `Post` save/delete signals; run this
+    after writes that bypass them (`QuerySet.update()`, raw SQL, restored
+    backups).
+
+    Usage:
+        python manage.py rebuild_search_index
+    """
+
+    help = "Rebuild the FTS5 index used by the ?q= post search."
+
+    def handle(self, *args, **options):
+        if not is_available():
+            raise CommandError(
+                f"The {FTS_TABLE} index is not available (SQLite with FTS5 "
+                f"and BLOG_SEARCH_BACKEND='fts' are required)."
+            )
+        count = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} posts."))
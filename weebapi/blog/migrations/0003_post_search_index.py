@@ -0,0 +1,47 @@
+from django.db import migrations
+
+
+# Frozen copy of the FTS5 index definition at the time of this migration,
+# so that later changes to `blog.search` do not change what it does.
+FTS_TABLE = "blog_post_fts"
+FTS_FIELDS = "title, excerpt, content, author"
+
+
+def forwards(apps, schema_editor):
+    """Create and fill the FTS5 table (no-op outside SQLite or w/o FTS5)."""
+    conn = schema_editor.connection
+    if conn.vendor != "sqlite":
+        return
+    with conn.cursor() as cursor:
+        cursor.execute("PRAGMA compile_options")
+        if "ENABLE_FTS5" not in {row[0] for row in cursor.fetchall()}:
+            return
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+            f"USING fts5({FTS_FIELDS}, prefix='2 3', tokenize='unicode61')"
+        )
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, {FTS_FIELDS}) "
+            f"SELECT id, {FTS_FIELDS} FROM blog_post"
+        )
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) "
+                       f"VALUES ('optimize')")
+
+
+def backwards(apps, schema_editor):
+    """Drop the FTS5 table, if any."""
+    if schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+    """Create the SQLite FTS5 index used by the `?q=` post search."""
+
+    dependencies = [
+        ('blog', '0002_alter_post_title'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
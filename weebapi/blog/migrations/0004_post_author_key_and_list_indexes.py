@@ -0,0 +1,42 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:53
+
+from django.db import migrations, models
+
+
+def normalize_author(name):
+    """Frozen copy of `blog.models.normalize_author` at this migration."""
+    return " ".join(name.split()).casefold()
+
+
+def fill_author_key(apps, schema_editor):
+    """Compute `author_key` for the existing posts."""
+    Post = apps.get_model('blog', 'Post')
+    posts = Post.objects.only('id', 'author')
+    batch = []
+    for post in posts.iterator(chunk_size=2000):
+        post.author_key = normalize_author(post.author)
+        batch.append(post)
+        if len(batch) == 2000:
+            Post.objects.bulk_update(batch, ['author_key'])
+            batch = []
+    Post.objects.bulk_update(batch, ['author_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_post_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='author_key',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=120),
+        ),
+        migrations.RunPython(fill_author_key, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['created_at', 'id'], name='post_published_recent_idx'),
+        ),
+    ]
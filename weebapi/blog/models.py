@@ -1,5 +1,27 @@
-from django.db import models
-from django.utils.text import slugify
+from django.db import IntegrityError, models, transaction
+
+from .slugs import allocate_slug
+
+
+# Number of slugs tried by `Post.save()` when concurrent saves keep taking
+# the allocated one first
+SLUG_ATTEMPTS = 5
+
+
+def normalize_author(name):
+    """
+    Normalize an author name for indexed lookups.
+
+    Collapses whitespace and case-folds the name, so that "  alice  Smith"
+    and "Alice smith" get the same key.
+
+    Args:
+        name (str): The author name.
+
+    Returns:
+        str: The normalized name.
+    """
+    return " ".join(name.split()).casefold()
 
 
 class Post(models.Model):
@@ -13,6 +35,8 @@ class Post(models.Model):
         excerpt (str): Optional short summary or preview of the content.
         content (str): The main body text of the post.
         author (str): The author’s name. Defaults to "Anonyme".
+        author_key (str): Normalized author name (see `normalize_author`),
+        indexed for the `?author=` filter. Maintained by `save`.
         is_published (bool): Indicates whether the post is publicly visible.
         created_at (datetime): Timestamp automatically set when the post is
         created.
@@ -25,6 +49,8 @@ class Post(models.Model):
     excerpt = models.CharField(max_length=300, blank=True)
     content = models.TextField()
     author = models.CharField(max_length=120, default="Anonyme")
+    author_key = models.CharField(max_length=120, db_index=True,
+                                  editable=False, default="")
     is_published = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -32,6 +58,17 @@ class Post(models.Model):
     class Meta:
         """Model metadata options."""
         ordering = ["-created_at"]  # Display most recent posts first
+        indexes = [
+            # Matches the list endpoint: published posts sorted by date,
+            # with the id as tie-breaker for keyset pagination. The ORM
+            # renders `is_published=True` as a bare `WHERE "is_published"`,
+            # which SQLite cannot match against the first column of an
+            # `(is_published, created_at, id)` index to walk it in date
+            # order; a partial index with that exact condition can be.
+            models.Index(fields=["created_at", "id"],
+                         condition=models.Q(is_published=True),
+                         name="post_published_recent_idx"),
+        ]
 
     def save(self, *args, **kwargs):
         """
@@ -41,21 +78,36 @@ class Post(models.Model):
         If the slug field is empty, it creates one from the title using
         Django’s `slugify`.
         If a slug already exists, appends a numeric suffix (-2, -3, etc.) to
-        ensure uniqueness.
+        ensure uniqueness. The suffix is found with a single query (see
+        `blog.slugs.next_suffix`), and if a concurrent save takes the same
+        slug first, the insert fails on the unique constraint and a new slug
+        is allocated, up to `SLUG_ATTEMPTS` times.
+
+        Also refreshes `author_key` from `author`.
 
         Args:
             *args: Variable length argument list passed to the parent class.
             **kwargs: Arbitrary keyword arguments passed to the parent class.
         """
-        if not self.slug:
-            base = slugify(self.title)
-            candidate = base
-            i = 1
-            while Post.objects.filter(slug=candidate).exists():
-                i += 1
-                candidate = f"{base}-{i}"
-            self.slug = candidate
-        super().save(*args, **kwargs)
+        self.author_key = normalize_author(self.author)
+        if self.slug:
+            super().save(*args, **kwargs)
+            return
+
+        for attempt in range(1, SLUG_ATTEMPTS + 1):
+            self.slug = allocate_slug(self.title)
+            try:
+                # Savepoint, so that a failed insert does not break an
+                # enclosing transaction
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+                return
+            except IntegrityError:
+                if attempt == SLUG_ATTEMPTS or not Post.objects.filter(
+                        slug=self.slug).exists():
+                    # Not a slug collision, or too many of them
+                    self.slug = ""
+                    raise
 
     def __str__(self):
         """
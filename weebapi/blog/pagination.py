@@ -0,0 +1,131 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class PostCursorPagination(BasePagination):
+    """
+    Keyset (cursor) pagination of posts on `(created_at, id)`.
+
+    Each page is fetched with a `WHERE (created_at, id) < cursor` condition
+    instead of an OFFSET, and no COUNT query is run, so every page costs
+    the same however deep it is. Follows the `ordering` query parameter:
+    `created_at` pages oldest first, anything else newest first.
+
+    The cursor is opaque to clients: they follow the `next` and `previous`
+    links of the response.
+
+    Response format:
+        {
+            "next": "http://.../api/posts/?pagination=cursor&cursor=...",
+            "previous": null,
+            "results": [...]
+        }
+    """
+
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self):
+        self.page_size = api_settings.PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.descending = (request.query_params.get("ordering")
+                           != "created_at")
+        position, reverse = self.decode_cursor(request)
+
+        # Walking backwards (for the previous page) flips the direction
+        descending = self.descending != reverse
+        sign = "-" if descending else ""
+        queryset = queryset.order_by(f"{sign}created_at", f"{sign}id")
+        if position is not None:
+            created_at, pk = position
+            lookup = "lt" if descending else "gt"
+            queryset = queryset.filter(
+                Q(**{f"created_at__{lookup}": created_at})
+                | Q(created_at=created_at, **{f"id__{lookup}": pk})
+            )
+
+        # One extra row tells whether there is a page after this one
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True,
+                         "format": "uri"},
+                "previous": {"type": "string", "nullable": True,
+                             "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, post, reverse):
+        """Build the URL of the page after (or before) `post`.
+
+        `post` is a `Post`, or a `values()` row with `created_at` and `id`.
+        """
+        if isinstance(post, dict):
+            created_at, pk = post["created_at"], post["id"]
+        else:
+            created_at, pk = post.created_at, post.pk
+        payload = json.dumps({
+            "c": created_at.isoformat(),
+            "i": pk,
+            "r": reverse,
+        }, separators=(",", ":"))
+        token = base64.urlsafe_b64encode(payload.encode()).decode()
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        """Return `((created_at, id) | None, reverse)` from the request."""
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode()))
+            position = (datetime.fromisoformat(payload["c"]),
+                        int(payload["i"]))
+            return position, bool(payload["r"])
+        except (binascii.Error, ValueError, KeyError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+
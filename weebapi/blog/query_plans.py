@@ -0,0 +1,73 @@
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+
+
+# (request path, text the plan of the page query must contain, whether the
+# rows must be read in index order rather than sorted afterwards)
+CASES = [
+    ("/api/posts/", "post_published_recent_idx", True),
+    ("/api/posts/?ordering=created_at", "post_published_recent_idx", True),
+    ("/api/posts/?pagination=cursor", "post_published_recent_idx", True),
+    ("/api/posts/?pagination=cursor&ordering=created_at",
+     "post_published_recent_idx", True),
+    ("/api/posts/?author=alice", "author_key", False),
+    ("/api/posts/?author_exact=alice", "author_key", False),
+    # Relevance ranks are computed once per query, not once per row
+    ("/api/posts/?q=alice", "MATERIALIZE ranked", False),
+]
+
+
+def explain(sql):
+    """Return the `EXPLAIN QUERY PLAN` lines of a SQL statement."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def page_query_plan(path):
+    """Request a post list endpoint and return the plan of its page query.
+
+    The page query is the one that selects full post rows (the other one,
+    if any, is the pagination COUNT). Responses are not cached, since a
+    cached response would not run any query.
+
+    Args:
+        path (str): Path and query string of the list endpoint variant.
+
+    Returns:
+        tuple[int, list[str]]: The HTTP status of the response, and the
+        `EXPLAIN QUERY PLAN` lines of the page query (empty if it ran
+        none).
+    """
+    with override_settings(ALLOWED_HOSTS=["testserver"],
+                           BLOG_RESPONSE_CACHE=False):
+        with CaptureQueriesContext(connection) as queries:
+            response = Client().get(path)
+    page_sql = [query["sql"] for query in queries.captured_queries
+                if query["sql"].startswith('SELECT "blog_post"')]
+    return response.status_code, explain(page_sql[-1]) if page_sql else []
+
+
+def plan_failures(path, status, plan, expected, in_order):
+    """Return what is wrong with the plan of one case, if anything.
+
+    Args:
+        path (str): Path of the case, used in the messages.
+        status (int): HTTP status of the response.
+        plan (list[str]): Plan lines returned by `page_query_plan`.
+        expected (str): Text one of the plan lines must contain.
+        in_order (bool): Whether the rows must be read in index order
+            rather than sorted in a temporary B-tree.
+
+    Returns:
+        list[str]: One message per failure, empty if the plan is fine.
+    """
+    if status != 200:
+        return [f"{path}: HTTP {status}"]
+    failures = []
+    if not any(expected in line for line in plan):
+        failures.append(f"{path}: no {expected} in the plan")
+    if in_order and any("TEMP B-TREE" in line for line in plan):
+        failures.append(f"{path}: results are sorted in memory")
+    return failures
@@ -0,0 +1,139 @@
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+
+# SQLite FTS5 index of the searchable Post fields, keyed by post id
+FTS_TABLE = "blog_post_fts"
+FTS_FIELDS = ("title", "excerpt", "content", "author")
+
+_available = None
+
+
+def is_available():
+    """Return True if the full-text index can be used.
+
+    The index only exists on SQLite builds with FTS5, and is only used when
+    the `BLOG_SEARCH_BACKEND` setting is "fts".
+    """
+    global _available
+    if settings.BLOG_SEARCH_BACKEND != "fts":
+        return False
+    if _available is None:
+        _available = (connection.vendor == "sqlite"
+                      and FTS_TABLE in connection.introspection.table_names())
+    return _available
+
+
+def rebuild_index(conn=connection):
+    """Re-index every post from scratch.
+
+    Needed after writes that bypass `Post.save()` / `delete()` signals,
+    such as `QuerySet.update()`.
+
+    Returns:
+        int: The number of indexed posts.
+    """
+    fields = ", ".join(FTS_FIELDS)
+    with conn.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, {fields}) "
+            f"SELECT id, {fields} FROM blog_post"
+        )
+        count = cursor.rowcount
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) "
+                       f"VALUES ('optimize')")
+    return count
+
+
+def index_posts(posts):
+    """Add or refresh the index entries of the given posts."""
+    if not is_available():
+        return
+    fields = ", ".join(FTS_FIELDS)
+    placeholders = ", ".join(["%s"] * (len(FTS_FIELDS) + 1))
+    rows = [(post.pk, *(getattr(post, field) for field in FTS_FIELDS))
+            for post in posts]
+    with connection.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s",
+                           [(row[0],) for row in rows])
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE} (rowid, {fields}) "
+            f"VALUES ({placeholders})",
+            rows,
+        )
+
+
+def unindex_posts(pks):
+    """Remove the index entries of the given post ids."""
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s",
+                           [(pk,) for pk in pks])
+
+
+def build_match_query(q):
+    """Translate a `?q=` value into an FTS5 query.
+
+    Like the `icontains` search, the whole value is looked up as one
+    phrase. Its words must appear in that order in one field, and the last
+    word may be the beginning of a longer word, so "djan" matches
+    "Django". Unlike `icontains`, words are not matched from the middle.
+
+    Args:
+        q (str): The raw search string.
+
+    Returns:
+        str | None: The FTS5 query, or None if `q` has no searchable word.
+    """
+    words = re.findall(r"\w+", q)
+    if not words:
+        return None
+    return '"' + " ".join(words) + '"*'
+
+
+def filter_posts(queryset, q):
+    """Restrict a Post queryset to the posts matching `q`.
+
+    Uses the FTS5 index when available, and annotates each post with its
+    relevance as `search_rank` (lower is more relevant); a `q` without any
+    word (e.g. only punctuation) matches no post. Otherwise falls back to
+    case-insensitive `icontains` lookups on every field.
+
+    Args:
+        queryset (QuerySet): The posts to search.
+        q (str): The raw search string.
+
+    Returns:
+        tuple[QuerySet, bool]: The filtered queryset, and whether it is
+        annotated with `search_rank`.
+    """
+    if not is_available():
+        condition = Q()
+        for field in FTS_FIELDS:
+            condition |= Q(**{f"{field}__icontains": q})
+        return queryset.filter(condition), False
+    match = build_match_query(q)
+    if match is None:
+        # Nothing the index can match, so skip the query altogether
+        return queryset.none(), False
+
+    matching = RawSQL(
+        f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]
+    )
+    # bm25 scans every match of the query to weigh its terms, so asking
+    # for the rank of one row at a time is quadratic. The ranks of all the
+    # matches are materialized once per query and looked up by id instead.
+    rank = RawSQL(
+        f"WITH ranked AS MATERIALIZED ("
+        f"SELECT rowid AS id, rank FROM {FTS_TABLE} "
+        f"WHERE {FTS_TABLE} MATCH %s) "
+        f"SELECT rank FROM ranked WHERE ranked.id = blog_post.id", [match]
+    )
+    return (queryset.filter(id__in=matching).annotate(search_rank=rank),
+            True)
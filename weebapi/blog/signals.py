@@ -0,0 +1,28 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .caching import invalidate_responses
+from .models import Post
+from .search import index_posts, unindex_posts
+
+
+@receiver(post_save, sender=Post)
+def index_saved_post(sender, instance, **kwargs):
+    """Keep the full-text index in sync when a post is created or edited."""
+    index_posts([instance])
+
+
+@receiver(post_delete, sender=Post)
+def unindex_deleted_post(sender, instance, **kwargs):
+    """Remove a deleted post from the full-text index."""
+    unindex_posts([instance.pk])
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_cached_responses(sender, **kwargs):
+    """Drop the cached post responses once the write is committed."""
+    # Invalidating before the commit would let a concurrent request cache
+    # the old rows again.
+    transaction.on_commit(invalidate_responses)
@@ -0,0 +1,126 @@
+import re
+
+from django.db.models import Count, IntegerField, Max, Q
+from django.db.models.functions import Cast, Substr
+from django.utils.text import slugify
+
+
+# A slug with a numeric suffix: (base, suffix)
+SUFFIX_RE = re.compile(r"^(.*)-([0-9]+)$")
+
+
+def slug_range(base):
+    """Return the `slug` lookups matching `base` and `base-<anything>`.
+
+    A range on the unique index of `slug` (`-` is followed by `.` in ASCII)
+    instead of `startswith`, which SQLite cannot run on the index.
+    """
+    return {"slug__gte": base, "slug__lt": f"{base}."}
+
+
+def next_suffix(base):
+    """Return the first free numeric suffix for `base`, in one query.
+
+    Suffixes follow the existing scheme: `base`, then `base-2`, `base-3`,
+    and so on. `base` is used whenever it is free, even if some `base-N`
+    belong to other titles (e.g. `attack-on-titan-2`). Otherwise the next
+    suffix is one past the highest one in use, so the slugs of deleted
+    posts are not handed out again.
+
+    Args:
+        base (str): The slugified title.
+
+    Returns:
+        int: 1 when `base` itself is free, otherwise the suffix to append.
+    """
+    from .models import Post
+
+    suffixed = Q(slug__regex=rf"^{re.escape(base)}-[0-9]+$")
+    taken = Post.objects.filter(Q(slug=base) | suffixed, **slug_range(base))
+    counts = taken.aggregate(
+        base_taken=Count("id", filter=Q(slug=base)),
+        top=Max(Cast(Substr("slug", len(base) + 2), IntegerField()),
+                filter=suffixed),
+    )
+    if not counts["base_taken"]:
+        return 1
+    return max(counts["top"] or 1, 1) + 1
+
+
+def with_suffix(base, suffix):
+    """Return `base` for suffix 1, `base-<suffix>` otherwise."""
+    return base if suffix == 1 else f"{base}-{suffix}"
+
+
+def allocate_slug(title):
+    """Return a free slug for a single title (see `next_suffix`)."""
+    base = slugify(title)
+    return with_suffix(base, next_suffix(base))
+
+
+def next_suffixes(bases, chunk_size=200):
+    """Return the first free suffix of many bases (see `next_suffix`).
+
+    Fetches the slugs of `chunk_size` bases per query, with one index range
+    per base, and finds the highest suffixes in Python.
+
+    Args:
+        bases (Iterable[str]): The slugified titles.
+        chunk_size (int): Bases looked up per query.
+
+    Returns:
+        dict[str, tuple[int, int]]: For each base, its first free suffix
+        and the highest suffix in use (1 if there is none). The suffixes
+        after the first free one start past the highest in use.
+    """
+    from .models import Post
+
+    bases = list(dict.fromkeys(bases))
+    suffixes = {}
+    for start in range(0, len(bases), chunk_size):
+        chunk = bases[start:start + chunk_size]
+        condition = Q()
+        for base in chunk:
+            condition |= Q(**slug_range(base))
+        # Bases in use as slugs, and highest suffix in use per base
+        taken = set()
+        top = {}
+        wanted = set(chunk)
+        for slug in Post.objects.filter(condition).values_list("slug",
+                                                               flat=True):
+            if slug in wanted:
+                taken.add(slug)
+            match = SUFFIX_RE.match(slug)
+            if match and match[1] in wanted:
+                top[match[1]] = max(top.get(match[1], 1), int(match[2]))
+        for base in chunk:
+            highest = top.get(base, 1)
+            suffixes[base] = (highest + 1 if base in taken else 1, highest)
+    return suffixes
+
+
+def allocate_slugs(titles, reserved=()):
+    """Allocate distinct, free slugs for many titles at once.
+
+    The existing suffixes of every distinct slugified title are looked up
+    in a few queries (see `next_suffixes`), then the titles of each group
+    are numbered in order.
+
+    Args:
+        titles (list[str]): The titles, e.g. of posts to bulk create.
+        reserved (set[str]): Slugs to treat as taken although they are not
+            in the database yet, e.g. kept by other posts of the same batch.
+
+    Returns:
+        list[str]: One slug per title, in the same order.
+    """
+    bases = [slugify(title) for title in titles]
+    suffixes = next_suffixes(bases)
+    slugs = []
+    for base in bases:
+        suffix, highest = suffixes[base]
+        while with_suffix(base, suffix) in reserved:
+            suffix = max(suffix, highest) + 1
+        slugs.append(with_suffix(base, suffix))
+        suffixes[base] = (max(suffix, highest) + 1, highest)
+    return slugs
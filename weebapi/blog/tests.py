@@ -0,0 +1,27 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+
+from .models import Post
+from .query_plans import CASES, page_query_plan, plan_failures
+
+
+@skipUnless(connection.vendor == "sqlite",
+            "Query plans are only checked on SQLite.")
+class PostListQueryPlanTests(TestCase):
+    """The post list queries must keep using the `Post` indexes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        Post.objects.create(title="Query plan check", content="-",
+                            author="Alice")
+
+    def test_list_variants_use_indexes(self):
+        for path, expected, in_order in CASES:
+            with self.subTest(path=path):
+                status, plan = page_query_plan(path)
+                self.assertEqual(
+                    plan_failures(path, status, plan, expected, in_order),
+                    [], "\n".join(plan),
+                )
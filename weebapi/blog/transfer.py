@@ -0,0 +1,206 @@
+import json
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_slug
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+
+from .caching import invalidate_responses
+from .models import SLUG_ATTEMPTS, Post, normalize_author
+from .search import index_posts
+from .serializers import PostSerializer
+from .slugs import allocate_slugs
+
+
+# Fields of each exported line, in order
+EXPORT_FIELDS = [
+    "title", "slug", "excerpt", "content", "author", "is_published",
+    "created_at", "updated_at",
+]
+
+
+# Timestamps restored from the file, although read-only in the API
+DATE_FIELDS = ["created_at", "updated_at"]
+
+
+class ImportedPostSerializer(PostSerializer):
+    """`PostSerializer` that also accepts the exported timestamps.
+
+    `created_at` and `updated_at` are read-only in the API, but an import
+    comes from a trusted export, whose dates and ordering must survive the
+    move. Lines without them get the import time.
+    """
+
+    created_at = serializers.DateTimeField(required=False)
+    updated_at = serializers.DateTimeField(required=False)
+
+
+class InvalidRecord(ValueError):
+    """An imported line that is not valid JSON or not a valid post.
+
+    Attributes:
+        line (int): The line number, starting at 1.
+        errors: The JSON error message or the serializer errors.
+    """
+
+    def __init__(self, line, errors):
+        if not isinstance(errors, str):
+            errors = json.dumps(errors, ensure_ascii=False)
+        super().__init__(f"Line {line}: {errors}")
+        self.line = line
+        self.errors = errors
+
+
+def export_posts(queryset=None, chunk_size=2000):
+    """Stream posts as NDJSON lines, in id order.
+
+    Rows are read with `.values().iterator(chunk_size=...)`, so only one
+    chunk of posts is held in memory at a time.
+
+    Args:
+        queryset (QuerySet | None): The posts to export (all by default).
+        chunk_size (int): Rows fetched from the database at a time.
+
+    Yields:
+        str: One JSON object with the `EXPORT_FIELDS` per line, ending in
+        a newline.
+    """
+    queryset = Post.objects.all() if queryset is None else queryset
+    rows = queryset.order_by("pk").values(*EXPORT_FIELDS)
+    for row in rows.iterator(chunk_size=chunk_size):
+        # Full precision ISO 8601 datetimes (DjangoJSONEncoder truncates
+        # them to milliseconds)
+        row["created_at"] = row["created_at"].isoformat()
+        row["updated_at"] = row["updated_at"].isoformat()
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+
+def import_posts(lines, batch_size=1000, skip_invalid=False):
+    """Create posts from NDJSON lines, one transaction per batch.
+
+    Every line is validated through `PostSerializer`, so the writable
+    fields follow the same rules as `POST /api/posts/`; `created_at` and
+    `updated_at` are kept from the line (see `ImportedPostSerializer`), or
+    set at import time if missing. A `slug` given in a line is kept
+    when it is valid and free, other posts get slugs allocated in bulk
+    (see `allocate_slugs`). Each batch is inserted with `bulk_create`,
+    then added to the search index, in a single transaction.
+
+    Args:
+        lines (Iterable[str]): NDJSON lines, e.g. an open file. Blank lines
+            are ignored.
+        batch_size (int): Lines validated and inserted per transaction.
+        skip_invalid (bool): Skip invalid lines instead of stopping.
+
+    Yields:
+        tuple[int, list[InvalidRecord]]: For each committed batch, the
+        number of posts created and the skipped lines.
+
+    Raises:
+        InvalidRecord: On the first invalid line, unless `skip_invalid` is
+            set. Batches before the one holding it are already committed.
+    """
+    numbered = enumerate(lines, start=1)
+    while True:
+        batch = list(islice(numbered, batch_size))
+        if not batch:
+            return
+        records, invalid = _validate(batch)
+        if invalid and not skip_invalid:
+            raise invalid[0]
+        yield (_insert(records) if records else 0), invalid
+
+
+def _validate(batch):
+    """Return the valid `(data, slug)` records and the invalid lines."""
+    # One serializer for the whole batch, like `PostSerializer(many=True)`
+    # does, but keeping the valid lines when others fail
+    serializer = ImportedPostSerializer()
+    records, invalid = [], []
+    for number, line in batch:
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError as e:
+            invalid.append(InvalidRecord(number, str(e)))
+            continue
+        if not isinstance(item, dict):
+            invalid.append(InvalidRecord(number, "Expected a JSON object."))
+            continue
+        try:
+            records.append((serializer.run_validation(item),
+                            item.get("slug")))
+        except serializers.ValidationError as e:
+            invalid.append(InvalidRecord(number, e.detail))
+    return records, invalid
+
+
+def _insert(records):
+    """Insert one batch of validated records, retrying on slug races."""
+    for attempt in range(1, SLUG_ATTEMPTS + 1):
+        posts = [Post(**data) for data, _ in records]
+        _assign_slugs(posts, [slug for _, slug in records])
+        for post in posts:
+            post.author_key = normalize_author(post.author)
+        try:
+            with transaction.atomic():
+                Post.objects.bulk_create(posts)
+                _restore_dates(posts, [data for data, _ in records])
+                # bulk_create does not send the signals that maintain the
+                # search index and the response cache
+                index_posts(posts)
+                transaction.on_commit(invalidate_responses)
+            return len(posts)
+        except IntegrityError:
+            # Only retry when a concurrent write took one of the slugs
+            if attempt == SLUG_ATTEMPTS or not Post.objects.filter(
+                    slug__in=[post.slug for post in posts]).exists():
+                raise
+
+
+def _restore_dates(posts, records):
+    """Write back the imported timestamps of freshly inserted posts.
+
+    `bulk_create` sets the `auto_now_add` / `auto_now` fields to the
+    current time, while `bulk_update` writes the values as they are.
+    """
+    dated = []
+    for post, data in zip(posts, records):
+        if any(field in data for field in DATE_FIELDS):
+            for field in DATE_FIELDS:
+                if field in data:
+                    setattr(post, field, data[field])
+            dated.append(post)
+    if dated:
+        Post.objects.bulk_update(dated, DATE_FIELDS)
+
+
+def _assign_slugs(posts, wanted):
+    """Keep the wanted slugs that are valid and free, allocate the rest."""
+    max_length = Post._meta.get_field("slug").max_length
+    candidates = set()
+    for slug in wanted:
+        if not isinstance(slug, str) or len(slug) > max_length:
+            continue
+        try:
+            validate_slug(slug)
+        except ValidationError:
+            continue
+        candidates.add(slug)
+    taken = set(Post.objects.filter(slug__in=candidates)
+                .values_list("slug", flat=True))
+
+    kept = set()
+    missing = []
+    for post, slug in zip(posts, wanted):
+        if slug in candidates and slug not in taken and slug not in kept:
+            post.slug = slug
+            kept.add(slug)
+        else:
+            missing.append(post)
+    allocated = allocate_slugs([post.title for post in missing],
+                               reserved=kept)
+    for post, slug in zip(missing, allocated):
+        post.slug = slug
@@ -1,28 +1,91 @@
 from rest_framework import generics, permissions
-from django.db.models import Q
-from .models import Post
-from .serializers import PostSerializer
+from rest_framework.response import Response
+from .caching import CachedResponseMixin
+from .models import Post, normalize_author
+from .pagination import PostCursorPagination
+from .search import filter_posts
+from .serializers import LIST_FIELDS, PostRowSerializer, PostSerializer
 
 
-class PostListCreateView(generics.ListCreateAPIView):
+class SparseFieldsMixin:
+    """
+    Support the `?fields=` sparse fieldset parameter on GET requests.
+
+    Only the requested serializer fields are output, and the queryset only
+    selects the columns they need (`QuerySet.only()`), plus the
+    `extra_columns` that the view itself reads.
+    """
+
+    # Fields output when `?fields=` is not given (None for all of them)
+    default_fields = None
+    # Columns read by the view besides the serialized fields
+    extra_columns = ()
+
+    def is_read(self):
+        return self.request.method in ("GET", "HEAD")
+
+    def get_fields(self):
+        """Return the serializer fields of the response."""
+        if not hasattr(self, "_fields"):
+            self._fields = PostSerializer.parse_fields(
+                self.request.query_params.get("fields"), self.default_fields
+            )
+        return self._fields
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self.is_read():
+            columns = PostSerializer.columns(self.get_fields())
+            qs = qs.only(*columns, *self.extra_columns)
+        return qs
+
+    def get_serializer(self, *args, **kwargs):
+        if self.is_read():
+            kwargs["fields"] = self.get_fields()
+        return super().get_serializer(*args, **kwargs)
+
+
+class PostListCreateView(CachedResponseMixin, SparseFieldsMixin,
+                         generics.ListCreateAPIView):
     """
     API view for listing all published posts or creating a new one.
 
-    - **GET**: Returns a list of all published posts.
-        Supports optional filtering, searching, and ordering.
+    - **GET**: Returns a list of all published posts, without their
+        `content`. Supports optional filtering, searching, ordering and
+        sparse fieldsets.
     - **POST**: Creates a new Post entry.
 
     ### Query Parameters
     - `q` (str, optional): Performs a text search in `title`, `excerpt`,
-      `content`, and `author` fields. Case-insensitive.
+      `content`, and `author` fields. Case-insensitive. Uses the SQLite
+      FTS5 index when available (the last word matches as a prefix), and
+      results are then sorted by relevance unless `ordering` is given.
       Example: `?q=python`
-    - `author` (str, optional): Filters posts by author name.
+    - `author` (str, optional): Filters posts whose author name starts
+      with this value, ignoring case and extra whitespace (uses the
+      indexed `author_key`).
       Example: `?author=Alice`
+    - `author_exact` (str, optional): Same as `author`, but the whole
+      name must match.
+      Example: `?author_exact=alice smith`
     - `ordering` (str, optional): Sorts results by creation date.
       Accepts:
         - `"created_at"` → oldest first
-        - `"-created_at"` → newest first (default)
+        - `"-created_at"` → newest first (default without `q`)
       Example: `?ordering=created_at`
+    - `fields` (str, optional): Comma-separated fields to output (and to
+      select from the database). Defaults to every field but `content`.
+      Example: `?fields=url,title,excerpt`
+    - `pagination` (str, optional): `"cursor"` switches to keyset
+      pagination on `(created_at, id)`: no total count, constant cost per
+      page, and `next`/`previous` links carrying an opaque `cursor`.
+      Results are then always sorted by creation date.
+      Example: `?pagination=cursor&author=John`
+
+    ### Caching
+    With `BLOG_RESPONSE_CACHE`, anonymous JSON GET responses are cached
+    and carry an ETag and a `Last-Modified` header; conditional requests
+    get a 304 (see `CachedResponseMixin`).
 
     ### Permissions
     `AllowAny` — anyone (authenticated or not) can view and create posts.
@@ -34,35 +97,67 @@ class PostListCreateView(generics.ListCreateAPIView):
     queryset = Post.objects.all()
     serializer_class = PostSerializer
     permission_classes = [permissions.AllowAny]
+    # The full content is left out of lists unless asked for
+    default_fields = LIST_FIELDS
+    # Read by the cursor pagination
+    extra_columns = ("id", "created_at")
+
+    @property
+    def paginator(self):
+        """Use cursor pagination when requested with `?pagination=cursor`."""
+        if not hasattr(self, "_paginator"):
+            if self.request.query_params.get("pagination") == "cursor":
+                self._paginator = PostCursorPagination()
+            else:
+                self._paginator = super().paginator
+        return self._paginator
+
+    def list(self, request, *args, **kwargs):
+        """List posts through the `PostRowSerializer` fast path."""
+        serializer = PostRowSerializer(self.get_fields(), request)
+        rows = self.filter_queryset(self.get_queryset()).values(
+            *serializer.columns, *self.extra_columns
+        )
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(rows))
 
     def get_queryset(self):
         qs = super().get_queryset().filter(is_published=True)
 
+        ranked = False
         q = self.request.query_params.get("q")
         if q:
-            qs = qs.filter(
-                Q(title__icontains=q)
-                | Q(excerpt__icontains=q)
-                | Q(content__icontains=q)
-                | Q(author__icontains=q)
-            )
+            qs, ranked = filter_posts(qs, q)
+
+        author_exact = self.request.query_params.get("author_exact")
+        if author_exact:
+            qs = qs.filter(author_key=normalize_author(author_exact))
 
-        author = self.request.query_params.get("author")
+        author = normalize_author(self.request.query_params.get("author", ""))
         if author:
-            qs = qs.filter(author__icontains=author)
+            # Range on the indexed key: every key starting with `author`
+            upper = author[:-1] + chr(ord(author[-1]) + 1)
+            qs = qs.filter(author_key__gte=author, author_key__lt=upper)
 
-        ordering = self.request.query_params.get("ordering", "-created_at")
+        ordering = self.request.query_params.get("ordering")
         if ordering not in ("created_at", "-created_at"):
+            if ranked:
+                # Most relevant first
+                return qs.order_by("search_rank", "-created_at")
             ordering = "-created_at"
 
         return qs.order_by(ordering)
 
 
-class PostRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
+class PostRetrieveUpdateDestroyView(CachedResponseMixin, SparseFieldsMixin,
+                                    generics.RetrieveUpdateDestroyAPIView):
     """
     API view for retrieving, updating, or deleting a single Post.
 
-    - GET: Returns a single Post by its slug.
+    - GET: Returns a single Post by its slug. Accepts the same `?fields=`
+      parameter as the list endpoint (all fields by default).
     - PUT/PATCH: Updates the specified Post.
     - DELETE: Removes the Post from the database.
 
@@ -70,6 +165,11 @@ class PostRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
         Uses the `slug` field for URL identification instead of the default
         `id`.
 
+    Caching:
+        With `BLOG_RESPONSE_CACHE`, anonymous JSON GET responses are
+        cached, with the post's `updated_at` as `Last-Modified` (see
+        `CachedResponseMixin`). PUT, PATCH and DELETE invalidate the cache.
+
     Permissions:
         AllowAny — anyone can view, edit, or delete posts.
         (In a real-world setup, this should typically be restricted.)
@@ -79,3 +179,10 @@ class PostRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = PostSerializer
     lookup_field = "slug"  # Identify using "slug" in the URL
     permission_classes = [permissions.AllowAny]
+    # Read for the Last-Modified header
+    extra_columns = ("updated_at",)
+
+    def get_object(self):
+        post = super().get_object()
+        self.last_modified = post.updated_at
+        return post
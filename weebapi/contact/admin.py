@@ -1,5 +1,8 @@
 from django.contrib import admin
-from .models import Contact
+from django.utils import timezone
+
+from .export import csv_response
+from .models import Contact, DailySatisfaction
 
 
 @admin.register(Contact)
@@ -17,6 +20,9 @@ class ContactAdmin(admin.ModelAdmin):
         - Allows searching by all main contact fields
         - Orders submissions by most recent first
         - Marks 'created_at' as read-only to prevent modification
+        - "Export selected contacts as CSV" action, streamed in constant
+          memory. With "Select all", it exports every contact matching the
+          current filters and search.
     """
 
     list_display = ("first_name", "last_name", "email_address",
@@ -26,3 +32,55 @@ class ContactAdmin(admin.ModelAdmin):
                      "email_address", "phone_number", "message")
     ordering = ("-created_at",)
     readonly_fields = ("created_at",)
+    actions = ["export_csv"]
+
+    @admin.action(description="Export selected contacts as CSV")
+    def export_csv(self, request, queryset):
+        """
+        Stream the selected contacts as a CSV download.
+
+        The admin builds `queryset` from the current changelist, so it
+        already honors the active filters and search.
+
+        Args:
+            request (HttpRequest): The admin request.
+            queryset (QuerySet): The selected contacts.
+
+        Returns:
+            StreamingHttpResponse: The CSV download.
+        """
+        filename = f"contacts-{timezone.now():%Y%m%d-%H%M%S}.csv"
+        return csv_response(queryset.order_by("pk"), filename=filename)
+
+
+@admin.register(DailySatisfaction)
+class DailySatisfactionAdmin(admin.ModelAdmin):
+    """
+    Read-only admin view of the daily satisfaction rollups.
+
+    Lists the satisfaction counts per day, browsable by date, without
+    querying the contacts. Rows are maintained by the contact write paths
+    and by the `rebuild_satisfaction_rollups` command, so they cannot be
+    edited here.
+    """
+
+    list_display = ("day", "contacts", "scored", "positive",
+                    "positive_share")
+    date_hierarchy = "day"
+    ordering = ("-day",)
+
+    @admin.display(description="positive share")
+    def positive_share(self, obj):
+        """Return the share of positive scores, as a percentage."""
+        if not obj.scored:
+            return "-"
+        return f"{obj.positive / obj.scored:.1%}"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
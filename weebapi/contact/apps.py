@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ContactConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'contact'
+
+    def ready(self):
+        # Keep the daily satisfaction rollups in sync with deleted contacts
+        from . import signals  # noqa: F401
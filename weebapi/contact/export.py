@@ -0,0 +1,76 @@
+import csv
+
+from django.http import StreamingHttpResponse
+
+
+# Columns of the CSV export, in order
+EXPORT_FIELDS = [
+    "id", "first_name", "last_name", "email_address", "phone_number",
+    "message", "satisfaction", "satisfaction_model_version", "created_at",
+    "updated_at",
+]
+
+# Leading characters that make spreadsheet applications read a cell as a
+# formula (CSV injection)
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+class Echo:
+    """File-like object whose `write` returns the value instead of storing
+    it, so that `csv.writer` formats rows without buffering them."""
+
+    def write(self, value):
+        return value
+
+
+def escape_cell(value):
+    """Return `value` so that spreadsheets do not run it as a formula.
+
+    The text columns come from the public contact form, so a message such
+    as `=HYPERLINK(...)` would otherwise be evaluated when the export is
+    opened in a spreadsheet. Strings starting with a formula character are
+    prefixed with a single quote, which spreadsheets display as text.
+    """
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def csv_lines(queryset, chunk_size=2000):
+    """Stream contacts as CSV lines, header first.
+
+    Rows are read with `.values_list().iterator(chunk_size=...)`, so memory
+    use does not depend on the number of contacts. Text cells that a
+    spreadsheet would run as formulas are escaped (see `escape_cell`).
+
+    Args:
+        queryset (QuerySet): The contacts to export, in the order to export
+            them.
+        chunk_size (int): Rows fetched from the database at a time.
+
+    Yields:
+        str: One CSV line (header, then one line per contact).
+    """
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    rows = queryset.values_list(*EXPORT_FIELDS)
+    for row in rows.iterator(chunk_size=chunk_size):
+        yield writer.writerow([escape_cell(value) for value in row])
+
+
+def csv_response(queryset, filename="contacts.csv", chunk_size=2000):
+    """Return a `StreamingHttpResponse` downloading contacts as CSV.
+
+    Args:
+        queryset (QuerySet): The contacts to export.
+        filename (str): The name of the downloaded file.
+        chunk_size (int): Rows fetched from the database at a time.
+
+    Returns:
+        StreamingHttpResponse: The CSV download.
+    """
+    return StreamingHttpResponse(
+        csv_lines(queryset, chunk_size=chunk_size),
+        content_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
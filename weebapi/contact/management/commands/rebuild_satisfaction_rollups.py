@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from contact.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    """
+    Recompute the daily satisfaction rollups from the contacts.
+
+    The rollups are kept up to date as contacts are created, rescored and
+    deleted; this command backfills them, or repairs them after contacts
+    were changed behind the ORM's back (raw SQL, `QuerySet.update()`).
+    The contacts of the range are grouped by day in a single query, and
+    the rollup rows of the range are replaced in one transaction.
+
+    Usage:
+        python manage.py rebuild_satisfaction_rollups
+        python manage.py rebuild_satisfaction_rollups --since 2025-01-01 \\
+            --until 2025-01-31
+    """
+
+    help = "Rebuild the daily satisfaction rollups from the contacts."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since", default=None,
+            help="First day to rebuild (YYYY-MM-DD).",
+        )
+        parser.add_argument(
+            "--until", default=None,
+            help="Last day to rebuild (YYYY-MM-DD).",
+        )
+
+    def handle(self, *args, **options):
+        dates = {}
+        for option in ("since", "until"):
+            dates[option] = None
+            if options[option]:
+                try:
+                    dates[option] = parse_date(options[option])
+                except ValueError:
+                    pass
+                if dates[option] is None:
+                    raise CommandError(f"Invalid --{option} date.")
+
+        started = time.perf_counter()
+        count = rebuild_rollups(**dates)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {count} daily rollups in {elapsed:.1f}s."
+        ))
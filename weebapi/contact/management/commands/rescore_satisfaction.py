@@ -0,0 +1,219 @@
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils.dateparse import parse_date
+
+from contact.models import Contact
+from contact.rescoring import (
+    RESCORE_FIELDS,
+    rescore_contacts,
+    rescore_ids,
+)
+from satisfaction.satisfaction import get_model_version
+
+
+class Command(BaseCommand):
+    """
+    Recompute `Contact.satisfaction` for stored contacts.
+
+    Contacts are streamed in primary key order with
+    `.iterator(chunk_size=...)`; each chunk is scored with a single model
+    call and written back with `bulk_update`, without going through
+    `Contact.save()`.
+
+    With `--workers N`, the parent process only reads primary keys, one
+    keyset page per chunk, and hands the chunks to N worker processes, each
+    loading the model once.
+
+    Progress is checkpointed as the highest id below which every contact
+    has been processed, so an interrupted run can be resumed with
+    `--checkpoint` (or `--after-id`) without skipping any contact.
+
+    Usage:
+        python manage.py rescore_satisfaction
+        python manage.py rescore_satisfaction --outdated --workers 4
+        python manage.py rescore_satisfaction --since 2025-01-01 \\
+            --until 2025-06-30 --checkpoint rescore.json
+    """
+
+    help = "Rescore Contact.satisfaction in chunks with the current model."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size", type=int, default=2000,
+            help="Contacts per model call and per bulk_update "
+                 "(default: %(default)s).",
+        )
+        parser.add_argument(
+            "--workers", type=int, default=1,
+            help="Number of worker processes (default: %(default)s).",
+        )
+        parser.add_argument(
+            "--after-id", type=int, default=None,
+            help="Only rescore contacts with a greater id.",
+        )
+        parser.add_argument(
+            "--checkpoint", default=None,
+            help="JSON file storing the last fully processed id. Read on "
+                 "start (unless --after-id is given) and updated as chunks "
+                 "complete.",
+        )
+        parser.add_argument(
+            "--since", default=None,
+            help="Only contacts created on or after this date (YYYY-MM-DD).",
+        )
+        parser.add_argument(
+            "--until", default=None,
+            help="Only contacts created on or before this date (YYYY-MM-DD).",
+        )
+        parser.add_argument(
+            "--model-version", default=None,
+            help="Only contacts scored by this model version.",
+        )
+        parser.add_argument(
+            "--outdated", action="store_true",
+            help="Only contacts not scored by the current model version.",
+        )
+
+    def handle(self, *args, **options):
+        self.checkpoint = options["checkpoint"]
+        after_id = options["after_id"]
+        if after_id is None:
+            after_id = self._read_checkpoint()
+
+        contacts = self._get_queryset(options, after_id)
+        total = contacts.count()
+        self.stdout.write(
+            f"Rescoring {total} contacts with model {get_model_version()} "
+            f"(after id {after_id})."
+        )
+
+        self.started = time.perf_counter()
+        self.total = total
+        self.done = 0
+        if options["workers"] > 1:
+            self._run_parallel(contacts, options)
+        else:
+            self._run_serial(contacts, options)
+
+        elapsed = time.perf_counter() - self.started
+        self.stdout.write(self.style.SUCCESS(
+            f"Rescored {self.done} contacts in {elapsed:.1f}s "
+            f"({self.done / elapsed if elapsed else 0:.0f} rows/s)."
+        ))
+
+    def _get_queryset(self, options, after_id):
+        """Build the filtered, id-ordered queryset of contacts to rescore."""
+        contacts = Contact.objects.exclude(message="").order_by("pk")
+        if after_id is not None:
+            contacts = contacts.filter(pk__gt=after_id)
+        for option, lookup in (("since", "created_at__date__gte"),
+                               ("until", "created_at__date__lte")):
+            if options[option]:
+                try:
+                    date = parse_date(options[option])
+                except ValueError:
+                    date = None
+                if date is None:
+                    raise CommandError(f"Invalid --{option} date.")
+                contacts = contacts.filter(**{lookup: date})
+        if options["model_version"] is not None:
+            contacts = contacts.filter(
+                satisfaction_model_version=options["model_version"]
+            )
+        if options["outdated"]:
+            contacts = contacts.exclude(
+                satisfaction_model_version=get_model_version()
+            )
+        return contacts
+
+    def _run_serial(self, contacts, options):
+        """Stream, score and update chunks in this process."""
+        chunk = []
+        rows = contacts.only(*RESCORE_FIELDS).iterator(
+            chunk_size=options["chunk_size"]
+        )
+        for contact in rows:
+            chunk.append(contact)
+            if len(chunk) == options["chunk_size"]:
+                self._complete(rescore_contacts(chunk), chunk[-1].pk)
+                chunk = []
+        if chunk:
+            self._complete(rescore_contacts(chunk), chunk[-1].pk)
+
+    def _run_parallel(self, contacts, options):
+        """Page through primary keys and fan chunks out to workers."""
+        workers = options["workers"]
+        # Connections must not be shared with the worker processes
+        connections.close_all()
+        # Spawned workers start from scratch and set up Django themselves
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(workers, mp_context=context,
+                                 initializer=django.setup) as pool:
+            # Futures in submission order, so the checkpoint only moves past
+            # chunks that are complete along with every chunk before them.
+            in_flight = deque()
+            for chunk in self._pk_chunks(contacts, options["chunk_size"]):
+                in_flight.append((pool.submit(rescore_ids, chunk), chunk[-1]))
+                # Bound memory: at most two chunks queued per worker
+                while len(in_flight) >= workers * 2:
+                    self._complete_oldest(in_flight)
+            while in_flight:
+                self._complete_oldest(in_flight)
+
+    def _pk_chunks(self, contacts, chunk_size):
+        """Yield the primary keys of `contacts` in chunks, in pk order.
+
+        Each chunk is read to the end by its own keyset query (`pk > last
+        pk of the previous chunk`), so no read cursor stays open while the
+        workers write: with SQLite, an open cursor in this process would
+        make their writes fail with "database is locked".
+        """
+        last_pk = None
+        while True:
+            page = contacts
+            if last_pk is not None:
+                page = page.filter(pk__gt=last_pk)
+            chunk = list(page.values_list("pk", flat=True)[:chunk_size])
+            if not chunk:
+                return
+            yield chunk
+            last_pk = chunk[-1]
+
+    def _complete_oldest(self, in_flight):
+        """Wait for the oldest submitted chunk and record its completion."""
+        future, last_pk = in_flight.popleft()
+        self._complete(future.result(), last_pk)
+
+    def _complete(self, count, last_pk):
+        """Report progress and checkpoint after a finished chunk."""
+        self.done += count
+        self._write_checkpoint(last_pk)
+        elapsed = time.perf_counter() - self.started
+        self.stdout.write(
+            f"{self.done}/{self.total} contacts, last id {last_pk}, "
+            f"{self.done / elapsed if elapsed else 0:.0f} rows/s"
+        )
+
+    def _read_checkpoint(self):
+        """Return the last processed id from the checkpoint file, if any."""
+        if not self.checkpoint or not os.path.exists(self.checkpoint):
+            return None
+        with open(self.checkpoint) as f:
+            return json.load(f)["last_id"]
+
+    def _write_checkpoint(self, last_pk):
+        """Atomically store the last fully processed id."""
+        if not self.checkpoint:
+            return
+        tmp_path = f"{self.checkpoint}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"last_id": last_pk}, f)
+        os.replace(tmp_path, self.checkpoint)
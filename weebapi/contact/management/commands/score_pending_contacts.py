@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from contact.scoring import score_pending
+
+
+class Command(BaseCommand):
+    """
+    Score every contact whose satisfaction has not been computed yet.
+
+    Useful when `CONTACT_ASYNC_SCORING` is enabled, to catch up on contacts
+    left pending by a restart, or from a cron job.
+
+    Usage:
+        python manage.py score_pending_contacts
+        python manage.py score_pending_contacts --batch-size 1000
+    """
+
+    help = "Score pending contacts (satisfaction NULL) in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Contacts per batch (default: CONTACT_SCORING_BATCH_SIZE).",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] is not None and options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        total = score_pending(options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Scored {total} contacts."))
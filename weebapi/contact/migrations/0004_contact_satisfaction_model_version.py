@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contact', '0003_contact_satisfaction'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contact',
+            name='satisfaction_model_version',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.7 on 2026-10-18 11:17
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+
+
+def fill_rollups(apps, schema_editor):
+    """Compute the daily rollups of the existing contacts."""
+    Contact = apps.get_model('contact', 'Contact')
+    DailySatisfaction = apps.get_model('contact', 'DailySatisfaction')
+    days = (Contact.objects.annotate(day=TruncDate('created_at'))
+            .values('day').order_by('day')
+            .annotate(contacts=Count('pk'),
+                      scored=Count('pk', filter=Q(satisfaction__isnull=False)),
+                      positive=Count('pk', filter=Q(satisfaction=1))))
+    DailySatisfaction.objects.bulk_create(
+        [DailySatisfaction(**row) for row in days]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contact', '0004_contact_satisfaction_model_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailySatisfaction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True)),
+                ('contacts', models.IntegerField(default=0)),
+                ('scored', models.IntegerField(default=0)),
+                ('positive', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'daily satisfaction',
+                'verbose_name_plural': 'daily satisfaction',
+                'ordering': ['-day'],
+            },
+        ),
+        migrations.RunPython(fill_rollups, migrations.RunPython.noop),
+    ]
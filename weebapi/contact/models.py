@@ -1,6 +1,15 @@
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import DEFERRED
 
-from satisfaction.satisfaction import analyze_satisfaction_binary
+from satisfaction.satisfaction import (
+    analyze_satisfaction_binary,
+    analyze_satisfaction_binary_many,
+    get_model_version,
+)
+
+from .rollups import RollupDelta
+from .scoring import get_scoring_worker
 
 
 class Contact(models.Model):
@@ -19,6 +28,8 @@ class Contact(models.Model):
         is modified.
         satisfaction (int | None): Optional numeric sentiment score,
         automatically derived from the message.
+        satisfaction_model_version (str): Version of the sentiment model that
+        computed `satisfaction` (see `get_model_version`).
     """
 
     first_name = models.CharField(max_length=30)
@@ -29,17 +40,41 @@ class Contact(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     satisfaction = models.IntegerField(null=True, blank=True)
+    satisfaction_model_version = models.CharField(max_length=64, blank=True,
+                                                  default="")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remember the message and satisfaction loaded from the database.
+
+        Used by `save` to skip inference when the message did not change,
+        and to update the daily rollups by the change of satisfaction.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_message = instance.__dict__.get("message")
+        instance._loaded_satisfaction = instance.__dict__.get("satisfaction",
+                                                              DEFERRED)
+        return instance
 
     def save(self, *args, **kwargs):
         """
         Override the save method to automatically analyze satisfaction from the
         message content.
 
-        If a message is provided, calls `analyze_satisfaction_binary`
-        to compute
-        a sentiment or satisfaction score and assigns it to the `satisfaction`
-        field
-        before saving the instance.
+        If a message is provided and differs from the one loaded from the
+        database (or the contact is new), computes a sentiment or
+        satisfaction score with `analyze_satisfaction_binary` and assigns it
+        to the `satisfaction` field before saving the instance. Saves that
+        leave the message unchanged (e.g. admin edits of other fields) skip
+        inference entirely.
+
+        When the `CONTACT_ASYNC_SCORING` setting is enabled, the contact is
+        saved immediately with `satisfaction=None` instead, and the
+        background `ScoringWorker` scores it once the transaction commits.
+
+        The `DailySatisfaction` rollup of the contact's creation day is
+        updated in the same transaction as the contact.
 
         Args:
             *args: Variable-length argument list passed to the parent save
@@ -47,7 +82,115 @@ class Contact(models.Model):
             **kwargs: Arbitrary keyword arguments passed to the parent save
             method.
         """
+        adding = self._state.adding
+        score_later = False
+        message_changed = (adding
+                           or self.message != getattr(self, "_loaded_message",
+                                                      None))
+        if self.message and message_changed:
+            if settings.CONTACT_ASYNC_SCORING:
+                self.satisfaction = None
+                self.satisfaction_model_version = ""
+                score_later = True
+            else:
+                self.satisfaction = analyze_satisfaction_binary(self.message)
+                self.satisfaction_model_version = get_model_version()
+
+        # Satisfaction stored before this save, to update the rollups
+        previous = None
+        if not adding:
+            previous = getattr(self, "_loaded_satisfaction", DEFERRED)
+            if previous is DEFERRED:
+                previous = (Contact.objects.filter(pk=self.pk)
+                            .values_list("satisfaction", flat=True).first())
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            delta = RollupDelta()
+            if adding:
+                delta.contact(self.created_at, self.satisfaction)
+            else:
+                delta.rescore(self.created_at, previous, self.satisfaction)
+            delta.apply()
+        self._loaded_message = self.message
+        self._loaded_satisfaction = self.satisfaction
+
+        if score_later:
+            transaction.on_commit(get_scoring_worker().schedule)
+
+    @classmethod
+    def create_many(cls, contacts):
+        """
+        Insert new contacts in bulk, scoring their messages at once.
+
+        Bulk counterpart of `save` for new contacts: the messages are
+        scored with a single `analyze_satisfaction_binary_many` call (or
+        left to the background `ScoringWorker` when `CONTACT_ASYNC_SCORING`
+        is enabled), then the contacts are inserted with `bulk_create` and
+        added to the `DailySatisfaction` rollups in one transaction.
+
+        Args:
+            contacts (list[Contact]): Unsaved contacts.
+
+        Returns:
+            list[Contact]: The same contacts, saved, with their primary
+            keys set.
+        """
+        to_score = [contact for contact in contacts if contact.message]
+        if settings.CONTACT_ASYNC_SCORING:
+            for contact in to_score:
+                contact.satisfaction = None
+                contact.satisfaction_model_version = ""
+        elif to_score:
+            scores = analyze_satisfaction_binary_many(
+                [contact.message for contact in to_score]
+            )
+            version = get_model_version()
+            for contact, score in zip(to_score, scores):
+                contact.satisfaction = score
+                contact.satisfaction_model_version = version
+
+        with transaction.atomic():
+            cls.objects.bulk_create(contacts)
+            delta = RollupDelta()
+            for contact in contacts:
+                delta.contact(contact.created_at, contact.satisfaction)
+            delta.apply()
+        for contact in contacts:
+            contact._loaded_message = contact.message
+            contact._loaded_satisfaction = contact.satisfaction
+
+        if settings.CONTACT_ASYNC_SCORING and to_score:
+            transaction.on_commit(get_scoring_worker().schedule)
+        return contacts
+
+
+class DailySatisfaction(models.Model):
+    """
+    Satisfaction counts of the contacts created on one day.
+
+    Maintained incrementally by every code path that creates, rescores or
+    deletes contacts (see `RollupDelta`), and recomputed from the contacts
+    by the `rebuild_satisfaction_rollups` command. Analytics only read
+    these rows, never the contacts themselves.
+
+    Attributes:
+        day (date): The day the contacts were created, in the current time
+        zone.
+        contacts (int): Number of contacts created that day.
+        scored (int): Number of them with a `satisfaction` score.
+        positive (int): Number of them with a positive score (1).
+    """
+
+    day = models.DateField(unique=True)
+    contacts = models.IntegerField(default=0)
+    scored = models.IntegerField(default=0)
+    positive = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ["-day"]
+        verbose_name = "daily satisfaction"
+        verbose_name_plural = "daily satisfaction"
 
-        if self.message:
-            self.satisfaction = analyze_satisfaction_binary(self.message)
-        super().save(*args, **kwargs)
+    def __str__(self):
+        return f"{self.day}: {self.positive}/{self.scored} positive"
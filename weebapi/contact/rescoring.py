@@ -0,0 +1,63 @@
+from django.db import transaction
+
+from satisfaction.satisfaction import (
+    analyze_satisfaction_binary_many,
+    get_model_version,
+)
+
+from .models import Contact
+from .rollups import RollupDelta
+
+
+# Fields to load on the contacts passed to `rescore_contacts`
+RESCORE_FIELDS = ("pk", "message", "satisfaction", "created_at")
+
+
+def rescore_contacts(contacts):
+    """Rescore a chunk of contacts with one model call.
+
+    Results are written back with `bulk_update`, which does not go through
+    `Contact.save()` and leaves `updated_at` untouched. The daily
+    satisfaction rollups are updated by the change of scores in the same
+    transaction.
+
+    Args:
+        contacts (list[Contact]): Contacts with at least `pk`, `message`,
+            `satisfaction` and `created_at` loaded.
+
+    Returns:
+        int: The number of contacts rescored.
+    """
+    scores = analyze_satisfaction_binary_many(
+        [contact.message for contact in contacts]
+    )
+    version = get_model_version()
+    delta = RollupDelta()
+    for contact, score in zip(contacts, scores):
+        delta.rescore(contact.created_at, contact.satisfaction, score)
+        contact.satisfaction = score
+        contact.satisfaction_model_version = version
+    with transaction.atomic():
+        Contact.objects.bulk_update(
+            contacts, ["satisfaction", "satisfaction_model_version"]
+        )
+        delta.apply()
+    return len(contacts)
+
+
+def rescore_ids(pks):
+    """Load and rescore the contacts with the given primary keys.
+
+    Used by the worker processes of `rescore_satisfaction`, which only
+    receive primary keys from the parent process.
+
+    Args:
+        pks (list[int]): Primary keys of the contacts to rescore.
+
+    Returns:
+        int: The number of contacts rescored.
+    """
+    contacts = list(Contact.objects.filter(pk__in=pks)
+                    .only(*RESCORE_FIELDS))
+    return rescore_contacts(contacts) if contacts else 0
+
@@ -0,0 +1,176 @@
+from collections import defaultdict
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate, TruncWeek
+from django.utils import timezone
+
+
+# Periods accepted by `satisfaction_series`
+PERIODS = ("day", "week")
+
+
+def rollup_day(created_at):
+    """Return the rollup day of a contact created at `created_at`.
+
+    Days are taken in the current time zone, like `TruncDate` does in
+    `rebuild_rollups`.
+    """
+    return timezone.localdate(created_at)
+
+
+class RollupDelta:
+    """Changes to the daily satisfaction rollups, applied in one go.
+
+    Every code path that creates, rescores or deletes contacts records its
+    changes here, then calls `apply()` in the same transaction as the
+    contact writes, so the rollups stay exact without ever reading the
+    contacts back.
+    """
+
+    def __init__(self):
+        # day -> [contacts, scored, positive]
+        self._days = defaultdict(lambda: [0, 0, 0])
+
+    def add(self, day, contacts=0, scored=0, positive=0):
+        """Add raw counts to one day."""
+        counts = self._days[day]
+        counts[0] += contacts
+        counts[1] += scored
+        counts[2] += positive
+
+    def contact(self, created_at, satisfaction, sign=1):
+        """Record a created (`sign=1`) or deleted (`sign=-1`) contact."""
+        self.add(rollup_day(created_at), contacts=sign,
+                 scored=sign * (satisfaction is not None),
+                 positive=sign * (satisfaction == 1))
+
+    def rescore(self, created_at, old, new, count=1):
+        """Record `count` contacts whose satisfaction went from `old` to
+        `new`."""
+        self.add(rollup_day(created_at),
+                 scored=count * ((new is not None) - (old is not None)),
+                 positive=count * ((new == 1) - (old == 1)))
+
+    def apply(self):
+        """Write the recorded changes to the rollup table.
+
+        Each changed day costs one UPDATE with `F()` expressions, so
+        concurrent writers never overwrite each other's counts. Days without
+        a rollup row yet are inserted first (ignoring rows inserted
+        concurrently) and updated again.
+        """
+        DailySatisfaction = apps.get_model("contact", "DailySatisfaction")
+        changed = sorted((day, counts) for day, counts in self._days.items()
+                         if any(counts))
+        self._days.clear()
+        if not changed:
+            return
+
+        def update(day, counts):
+            contacts, scored, positive = counts
+            return DailySatisfaction.objects.filter(day=day).update(
+                contacts=F("contacts") + contacts,
+                scored=F("scored") + scored,
+                positive=F("positive") + positive,
+            )
+
+        with transaction.atomic():
+            missing = [(day, counts) for day, counts in changed
+                       if not update(day, counts)]
+            if missing:
+                DailySatisfaction.objects.bulk_create(
+                    [DailySatisfaction(day=day) for day, _ in missing],
+                    ignore_conflicts=True,
+                )
+                for day, counts in missing:
+                    update(day, counts)
+
+
+def rebuild_rollups(since=None, until=None):
+    """Recompute the daily rollups from the contacts.
+
+    Used to backfill the rollups, or to repair them after contacts were
+    changed without going through the code paths that record a
+    `RollupDelta` (e.g. raw SQL or `QuerySet.update()`). The contacts are
+    grouped by day in a single query, and the rollup rows of the range are
+    replaced in the same transaction.
+
+    Args:
+        since (date | None): First day to rebuild (from the first contact
+            by default).
+        until (date | None): Last day to rebuild (up to the last contact
+            by default).
+
+    Returns:
+        int: The number of rollup rows written.
+    """
+    Contact = apps.get_model("contact", "Contact")
+    DailySatisfaction = apps.get_model("contact", "DailySatisfaction")
+    contacts = Contact.objects.all()
+    rollups = DailySatisfaction.objects.all()
+    if since is not None:
+        contacts = contacts.filter(created_at__date__gte=since)
+        rollups = rollups.filter(day__gte=since)
+    if until is not None:
+        contacts = contacts.filter(created_at__date__lte=until)
+        rollups = rollups.filter(day__lte=until)
+
+    days = (contacts.annotate(day=TruncDate("created_at"))
+            .values("day").order_by("day")
+            .annotate(contacts=Count("pk"),
+                      scored=Count("pk",
+                                   filter=Q(satisfaction__isnull=False)),
+                      positive=Count("pk", filter=Q(satisfaction=1))))
+    with transaction.atomic():
+        rollups.delete()
+        created = DailySatisfaction.objects.bulk_create(
+            [DailySatisfaction(**row) for row in days]
+        )
+    return len(created)
+
+
+def satisfaction_series(since, until, period="day"):
+    """Return the satisfaction counts per day or week, from the rollups.
+
+    Only rollup rows are read; weeks are summed by the database. Days (or
+    weeks) without any contact are left out.
+
+    Args:
+        since (date): First day of the range.
+        until (date): Last day of the range, included.
+        period (str): "day" or "week" (weeks start on Monday and are
+            labelled with their first day).
+
+    Returns:
+        list[dict]: One dict per period, in date order, with the `date`,
+        the number of `contacts`, of `scored` contacts, of `positive`
+        ones, and the `positive_share` of scored contacts (None when no
+        contact was scored).
+    """
+    DailySatisfaction = apps.get_model("contact", "DailySatisfaction")
+    # Days whose contacts were all deleted keep a row of zeros
+    rows = DailySatisfaction.objects.filter(day__gte=since, day__lte=until,
+                                            contacts__gt=0)
+    if period == "week":
+        rows = (rows.annotate(date=TruncWeek("day"))
+                .values("date").order_by("date")
+                .annotate(contacts=Sum("contacts"), scored=Sum("scored"),
+                          positive=Sum("positive")))
+    else:
+        rows = (rows.order_by("day")
+                .values("contacts", "scored", "positive", date=F("day")))
+    return [{"date": row["date"], **with_share(row)} for row in rows]
+
+
+def with_share(row):
+    """Return the counts of `row` along with their `positive_share`."""
+    scored = row["scored"]
+    return {
+        "contacts": row["contacts"],
+        "scored": scored,
+        "positive": row["positive"],
+        "positive_share": (round(row["positive"] / scored, 4) if scored
+                           else None),
+    }
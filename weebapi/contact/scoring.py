@@ -0,0 +1,139 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Q
+
+from satisfaction.satisfaction import (
+    analyze_satisfaction_binary_many,
+    get_model_version,
+)
+
+from .rollups import RollupDelta, rollup_day
+
+
+logger = logging.getLogger(__name__)
+
+# Rows per UPDATE in `score_pending`. Each row adds one OR term to the WHERE
+# clause, and SQLite rejects expressions more than 1000 levels deep.
+UPDATE_CHUNK_SIZE = 300
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def score_pending(batch_size=None):
+    """Score every contact whose satisfaction has not been computed yet.
+
+    Pending contacts (non-empty message, `satisfaction` NULL) are read in
+    primary key order, `batch_size` at a time. Each batch is scored with a
+    single model call and written back with one UPDATE per score value
+    (and per `UPDATE_CHUNK_SIZE` rows), which does not go through
+    `Contact.save()`. Rows are only updated if their `updated_at` did not
+    change in the meantime, so a contact whose message was edited while
+    its batch was being scored stays pending and is scored again with its
+    new message. Updates are split by creation
+    day as well, so that the rows each one actually updated can be added
+    to the daily satisfaction rollups in the same transaction.
+
+    Args:
+        batch_size (int | None): Number of contacts per batch. Defaults to
+            the `CONTACT_SCORING_BATCH_SIZE` setting.
+
+    Returns:
+        int: The number of contacts scored.
+    """
+    Contact = apps.get_model("contact", "Contact")
+    batch_size = batch_size or settings.CONTACT_SCORING_BATCH_SIZE
+    pending = (Contact.objects.filter(satisfaction__isnull=True)
+               .exclude(message="").order_by("pk")
+               .only("pk", "message", "created_at", "updated_at"))
+
+    total = 0
+    last_pk = 0
+    while True:
+        batch = list(pending.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            return total
+        last_pk = batch[-1].pk
+        scores = analyze_satisfaction_binary_many(
+            [contact.message for contact in batch]
+        )
+
+        groups = {}
+        for contact, score in zip(batch, scores):
+            key = (rollup_day(contact.created_at), score)
+            groups.setdefault(key, []).append(contact)
+        with transaction.atomic():
+            delta = RollupDelta()
+            for (day, score), contacts in groups.items():
+                for i in range(0, len(contacts), UPDATE_CHUNK_SIZE):
+                    condition = Q()
+                    for contact in contacts[i:i + UPDATE_CHUNK_SIZE]:
+                        condition |= Q(pk=contact.pk,
+                                       updated_at=contact.updated_at)
+                    count = Contact.objects.filter(
+                        condition, satisfaction__isnull=True
+                    ).update(satisfaction=score,
+                             satisfaction_model_version=get_model_version())
+                    delta.add(day, scored=count,
+                              positive=count * (score == 1))
+                    total += count
+            delta.apply()
+
+
+class ScoringWorker:
+    """Background thread that scores pending contacts.
+
+    `schedule()` is cheap and can be called after every contact save: at
+    most one drain of the pending contacts is queued at a time, and it runs
+    on a single dedicated thread, outside of the request/response cycle.
+    Pending rows are stored in the database (`satisfaction` NULL), so rows
+    left over by a restart are picked up by the next drain or by the
+    `score_pending_contacts` command.
+    """
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="contact-scoring"
+        )
+        self._lock = threading.Lock()
+        self._scheduled = False
+
+    def schedule(self):
+        """Queue a drain of the pending contacts, unless one is queued."""
+        with self._lock:
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._executor.submit(self._run)
+
+    def _run(self):
+        """Drain the pending contacts and release the DB connection."""
+        # Reset the flag first, so contacts saved during this drain
+        # schedule another one.
+        with self._lock:
+            self._scheduled = False
+        try:
+            score_pending()
+        except Exception:
+            logger.exception("Scoring pending contacts failed.")
+        finally:
+            connections.close_all()
+
+
+def get_scoring_worker():
+    """Return the process-wide `ScoringWorker`, creating it on first use.
+
+    Returns:
+        ScoringWorker: The shared worker.
+    """
+    global _worker
+    if _worker is None:
+        with _worker_lock:
+            if _worker is None:
+                _worker = ScoringWorker()
+    return _worker
@@ -1,9 +1,83 @@
 from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+from core.metrics import TimedSerializerMixin
 
 from .models import Contact
 
 
-class ContactSerializer(serializers.HyperlinkedModelSerializer):
+class ContactListSerializer(TimedSerializerMixin,
+                            serializers.ListSerializer):
+    """
+    List serializer used by `ContactSerializer(many=True)`.
+
+    Unlike the default `ListSerializer`, an invalid item does not make the
+    whole list invalid: the valid items are kept in `validated_data` (and
+    created by `save()`), while the errors of the others are collected in
+    `item_errors`. Errors about the list itself (not a list, empty, too
+    long) still make `is_valid()` fail.
+
+    Attributes:
+        item_errors (dict[int, dict]): Validation errors by index of the
+        invalid items in the submitted list.
+    """
+
+    def to_internal_value(self, data):
+        """
+        Validate every item, keeping the valid ones.
+
+        Args:
+            data (list): The submitted items.
+
+        Returns:
+            list[dict]: The validated data of the valid items, in order.
+
+        Raises:
+            ValidationError: If `data` is not an acceptable list.
+        """
+        if not isinstance(data, list):
+            self.fail_list("not_a_list", input_type=type(data).__name__)
+        if not self.allow_empty and not data:
+            self.fail_list("empty")
+        if self.max_length is not None and len(data) > self.max_length:
+            self.fail_list("max_length", max_length=self.max_length)
+
+        self.item_errors = {}
+        validated = []
+        for index, item in enumerate(data):
+            try:
+                validated.append(self.run_child_validation(item))
+            except serializers.ValidationError as exc:
+                self.item_errors[index] = exc.detail
+        return validated
+
+    def fail_list(self, key, **kwargs):
+        """Raise the `key` error about the list itself."""
+        message = self.error_messages[key].format(**kwargs)
+        raise serializers.ValidationError(
+            {api_settings.NON_FIELD_ERRORS_KEY: [message]}, code=key
+        )
+
+    def create(self, validated_data):
+        """
+        Create the contacts with `Contact.create_many`.
+
+        All messages are scored with one model call, and the contacts are
+        inserted with `bulk_create` in a single transaction.
+
+        Args:
+            validated_data (list[dict]): The validated items.
+
+        Returns:
+            list[Contact]: The created contacts.
+        """
+        return Contact.create_many(
+            [Contact(**item) for item in validated_data]
+        )
+
+
+class ContactSerializer(TimedSerializerMixin,
+                        serializers.HyperlinkedModelSerializer):
     """
     Serializer for the Contact model.
 
@@ -12,6 +86,9 @@ class ContactSerializer(serializers.HyperlinkedModelSerializer):
     Uses a HyperlinkedModelSerializer to optionally include hyperlinks
     in API responses if a `request` context is provided.
 
+    With `many=True`, items are validated with `ContactListSerializer`,
+    which keeps the valid ones when others fail, and created in bulk.
+
     Fields:
         - first_name: The sender's first name.
         - last_name: The sender's last name.
@@ -26,9 +103,12 @@ class ContactSerializer(serializers.HyperlinkedModelSerializer):
 
         Attributes:
             model (Contact): The model being serialized.
+            list_serializer_class (type): The serializer used with
+            `many=True`.
             fields (list[str]): The fields to include in the serialized
             representation.
         """
         model = Contact
+        list_serializer_class = ContactListSerializer
         fields = ['first_name', 'last_name',
                   'phone_number', 'email_address', 'message']
@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import Contact
+from .rollups import RollupDelta
+
+
+@receiver(post_delete, sender=Contact)
+def remove_deleted_contact(sender, instance, **kwargs):
+    """Take a deleted contact out of its daily satisfaction rollup."""
+    delta = RollupDelta()
+    delta.contact(instance.created_at, instance.satisfaction, sign=-1)
+    delta.apply()
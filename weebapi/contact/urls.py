@@ -1,6 +1,13 @@
 from django.urls import path
-from .views import contact_create
+from .views import (
+    contact_bulk_create,
+    contact_create,
+    satisfaction_analytics,
+)
 
 urlpatterns = [
-    path('contact/', contact_create, name='contact-create')
+    path('contact/', contact_create, name='contact-create'),
+    path('contact/bulk/', contact_bulk_create, name='contact-bulk-create'),
+    path('contact/satisfaction/', satisfaction_analytics,
+         name='contact-satisfaction'),
 ]
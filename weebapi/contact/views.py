@@ -1,10 +1,20 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
 
+from .rollups import PERIODS, satisfaction_series, with_share
 from .serializers import ContactSerializer
 
 
+# Default number of days returned by the satisfaction analytics
+ANALYTICS_DEFAULT_DAYS = 30
+
+
 @api_view(['POST'])
 def contact_create(request):
     """
@@ -41,3 +51,154 @@ def contact_create(request):
         serializer.save()
         return Response(serializer.data, status=status.HTTP_201_CREATED)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['POST'])
+def contact_bulk_create(request):
+    """
+    Handle bursts of contact messages sent in a single POST request.
+
+    Items are validated with `ContactSerializer(many=True)`; the valid ones
+    are created even when others are invalid. All their messages are
+    scored with one model call and the contacts are inserted with
+    `bulk_create` in a single transaction (see `Contact.create_many`).
+
+    Request body (JSON): a list of at most `CONTACT_BULK_MAX_SIZE`
+    contacts, each like the body of `contact_create`.
+        [
+            {"first_name": "John", "last_name": "Doe", ...},
+            {"first_name": "Jane", "last_name": "Doe", ...}
+        ]
+
+    Example response:
+        HTTP 201 Created
+        {
+            "created": 1,
+            "failed": 1,
+            "results": [
+                {"index": 0, "status": "created", "data": {...}},
+                {"index": 1, "status": "invalid",
+                 "errors": {"email_address": ["Enter a valid email ..."]}}
+            ]
+        }
+
+    Responses:
+        201 Created — At least one contact was created. `results` holds
+            one entry per submitted item, in order.
+        400 Bad Request — The body is not an acceptable list, or no item
+            is valid (same body as above, with `created` 0).
+
+    Args:
+        request (Request): The incoming HTTP request containing the list of
+        contacts.
+
+    Returns:
+        Response: A DRF Response object with the per-item results or the
+        errors.
+    """
+    serializer = ContactSerializer(data=request.data, many=True,
+                                   allow_empty=False,
+                                   max_length=settings.CONTACT_BULK_MAX_SIZE)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    created_data = iter(ContactSerializer(serializer.save(), many=True).data)
+    errors = serializer.item_errors
+
+    results = []
+    for index in range(len(request.data)):
+        if index in errors:
+            results.append({"index": index, "status": "invalid",
+                            "errors": errors[index]})
+        else:
+            results.append({"index": index, "status": "created",
+                            "data": next(created_data)})
+    created = len(request.data) - len(errors)
+    return Response(
+        {"created": created, "failed": len(errors), "results": results},
+        status=(status.HTTP_201_CREATED if created
+                else status.HTTP_400_BAD_REQUEST)
+    )
+
+
+@api_view(['GET'])
+def satisfaction_analytics(request):
+    """
+    Report the share of positive contact messages per day or week.
+
+    Reads the `DailySatisfaction` rollups only, so the cost depends on the
+    length of the range, not on the number of contacts.
+
+    Query parameters:
+        since (YYYY-MM-DD): First day (default: 29 days before `until`).
+            With `period=week`, moved back to the Monday of its week.
+        until (YYYY-MM-DD): Last day, included (default: today).
+        period ("day" | "week"): Grouping of the results (default: "day").
+
+    Example response:
+        HTTP 200 OK
+        {
+            "since": "2025-01-06",
+            "until": "2025-01-19",
+            "period": "week",
+            "total": {"contacts": 120, "scored": 118, "positive": 80,
+                      "positive_share": 0.678},
+            "results": [
+                {"date": "2025-01-06", "contacts": 70, "scored": 69,
+                 "positive": 50, "positive_share": 0.7246},
+                ...
+            ]
+        }
+
+    Responses:
+        200 OK — The counts of every day or week with contacts.
+        400 Bad Request — Invalid date, range or period.
+
+    Args:
+        request (Request): The incoming HTTP request.
+
+    Returns:
+        Response: A DRF Response object with the counts or an error.
+    """
+    period = request.query_params.get("period", "day")
+    if period not in PERIODS:
+        return Response(
+            {"error": f"'period' must be one of {', '.join(PERIODS)}."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    dates = {}
+    for name in ("since", "until"):
+        value = request.query_params.get(name)
+        try:
+            dates[name] = parse_date(value) if value else None
+        except ValueError:
+            # Well-formed but impossible, e.g. 2025-02-30
+            dates[name] = None
+        if value and dates[name] is None:
+            return Response(
+                {"error": f"'{name}' must be a YYYY-MM-DD date."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+    until = dates["until"] or timezone.localdate()
+    since = (dates["since"]
+             or until - timedelta(days=ANALYTICS_DEFAULT_DAYS - 1))
+    if period == "week":
+        since -= timedelta(days=since.weekday())
+    if since > until:
+        return Response(
+            {"error": "'since' must not be after 'until'."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    results = satisfaction_series(since, until, period)
+    total = with_share({
+        key: sum(row[key] for row in results)
+        for key in ("contacts", "scored", "positive")
+    })
+    return Response({
+        "since": since,
+        "until": until,
+        "period": period,
+        "total": total,
+        "results": results,
+    })
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'core'
+
+    def ready(self):
+        # Time the queries of every connection, whichever thread opens it
+        from .metrics import install_query_timer
+        connection_created.connect(install_query_timer)
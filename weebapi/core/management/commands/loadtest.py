@@ -0,0 +1,189 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.loadtest import (
+    DEFAULT_MIX,
+    ASGITarget,
+    Budget,
+    HTTPTarget,
+    RequestFactory,
+    WSGITarget,
+    parse_mix,
+    report,
+    run,
+    seed,
+)
+from core.asgi import application as asgi_application
+from core.wsgi import application as wsgi_application
+
+
+class Command(BaseCommand):
+    """
+    Load test the API with concurrent clients and report its capacity.
+
+    Each of the `--concurrency` clients sends requests back to back
+    (`/api/satisfaction/`, `/api/contact/`, `/api/posts/` and
+    `/api/posts/<slug>/`, picked according to `--mix`) until `--requests`
+    requests have been sent or `--duration` seconds have passed. Published
+    posts are seeded through the API first, up to `--posts`.
+
+    Targets:
+        wsgi: `core.wsgi.application`, called in-process from threads.
+        asgi: `core.asgi.application`, driven in-process by asyncio.
+        http: a server already running at `--url` (e.g. `runserver`).
+
+    The report gives, per kind of request and overall, the throughput,
+    the latency percentiles, the error rate and the mean time spent in the
+    database, inference and serialization (from the `Server-Timing`
+    header). In-process targets use the database of the settings this
+    command runs with, so use the benchmark settings to keep the synthetic
+    data out of the development database.
+
+    Usage:
+        python manage.py loadtest --settings benchmarks.settings
+        python manage.py loadtest --settings benchmarks.settings \\
+            --target asgi --concurrency 32 --duration 30 \\
+            --mix list=8,detail=8,satisfaction=1
+        python manage.py loadtest --target http \\
+            --url http://127.0.0.1:8000 --output loadtest.json
+    """
+
+    help = "Load test the API in-process or against a local server."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target", choices=("wsgi", "asgi", "http"), default="wsgi",
+            help="Where to send the requests (default: %(default)s).",
+        )
+        parser.add_argument(
+            "--url", default="http://127.0.0.1:8000",
+            help="Server URL for --target http (default: %(default)s).",
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=8,
+            help="Number of concurrent clients (default: %(default)s).",
+        )
+        parser.add_argument(
+            "--requests", type=int, default=1000,
+            help="Number of measured requests (default: %(default)s).",
+        )
+        parser.add_argument(
+            "--duration", type=float, default=None,
+            help="Run for this many seconds instead of --requests.",
+        )
+        parser.add_argument(
+            "--warmup", type=int, default=50,
+            help="Unmeasured requests sent first (default: %(default)s).",
+        )
+        parser.add_argument(
+            "--mix", default=DEFAULT_MIX,
+            help="Relative weight of each kind of request "
+                 "(default: %(default)s).",
+        )
+        parser.add_argument(
+            "--posts", type=int, default=200,
+            help="Published posts to seed, if there are fewer "
+                 "(default: %(default)s).",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0,
+            help="Random seed (default: %(default)s).",
+        )
+        parser.add_argument(
+            "--output", default=None,
+            help="Also write the report to this JSON file.",
+        )
+
+    def handle(self, *args, **options):
+        if options["concurrency"] < 1:
+            raise CommandError("--concurrency must be at least 1.")
+        try:
+            mix = parse_mix(options["mix"])
+        except ValueError as e:
+            raise CommandError(str(e))
+        target = self._get_target(options)
+        if target.name != "http" and settings.DEBUG:
+            self.stderr.write(
+                "DEBUG is on, so Django records every query and the "
+                "results are pessimistic; consider --settings "
+                "benchmarks.settings."
+            )
+
+        try:
+            created, slugs, pages = seed(target, options["posts"],
+                                         seed=options["seed"])
+            factory = RequestFactory(mix, slugs, pages)
+        except (OSError, RuntimeError, ValueError) as e:
+            raise CommandError(f"Seeding failed: {e}")
+        self.stdout.write(f"Seeded {created} posts ({len(slugs)} used for "
+                          f"detail requests, {pages} list pages).")
+
+        if options["warmup"]:
+            run(target, factory, options["concurrency"],
+                Budget(requests=options["warmup"]), seed=options["seed"])
+        budget = (Budget(duration=options["duration"])
+                  if options["duration"] is not None
+                  else Budget(requests=options["requests"]))
+        self.stdout.write(
+            f"Running {target.name} load test with "
+            f"{options['concurrency']} clients..."
+        )
+        samples, elapsed = run(target, factory, options["concurrency"],
+                               budget, seed=options["seed"] + 1)
+        if not samples:
+            raise CommandError("No request was sent.")
+        rows = report(samples, elapsed)
+        self._print(rows)
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump({
+                    "target": target.name,
+                    "concurrency": options["concurrency"],
+                    "mix": mix,
+                    "elapsed_s": elapsed,
+                    "results": rows,
+                }, f, indent=2)
+
+        overall = rows[-1]
+        style = (self.style.WARNING if overall["errors"]
+                 else self.style.SUCCESS)
+        self.stdout.write(style(
+            f"{overall['requests']} requests in {elapsed:.1f}s: "
+            f"{overall['throughput']:.1f} req/s, p99 "
+            f"{overall['p99_ms']:.1f}ms, {overall['error_rate']:.2%} errors."
+        ))
+
+    def _get_target(self, options):
+        """Build the target selected by `--target`."""
+        if options["target"] == "http":
+            try:
+                return HTTPTarget(options["url"])
+            except ValueError as e:
+                raise CommandError(str(e))
+        if options["target"] == "asgi":
+            return ASGITarget(asgi_application)
+        return WSGITarget(wsgi_application)
+
+    def _print(self, rows):
+        """Print the report as a table."""
+        self.stdout.write(
+            f"{'kind':12} {'requests':>8} {'errors':>7} {'req/s':>8} "
+            f"{'p50':>8} {'p90':>8} {'p95':>8} {'p99':>8} {'max':>8}  "
+            f"server timing (mean ms)"
+        )
+        for row in rows:
+            timing = ", ".join(f"{name} {duration:.1f}" for name, duration
+                               in row["server_timing_ms"].items())
+            self.stdout.write(
+                f"{row['kind']:12} {row['requests']:8} "
+                f"{row['error_rate']:7.1%} {row['throughput']:8.1f} "
+                f"{row['p50_ms']:8.1f} {row['p90_ms']:8.1f} "
+                f"{row['p95_ms']:8.1f} {row['p99_ms']:8.1f} "
+                f"{row['max_ms']:8.1f}  {timing}"
+            )
+        for row in rows[:-1]:
+            for error, count in row["error_counts"].items():
+                self.stderr.write(f"{row['kind']}: {count} x {error}")
@@ -0,0 +1,400 @@
+"""
+Lightweight request instrumentation and Prometheus metrics.
+
+`RequestMetricsMiddleware` (see `core.middleware`) opens a
+`RequestMetrics` for every request. Code that does measurable work wraps
+it in `measure(name)` (DRF serialization, sentiment inference), and
+database queries are timed by an execute wrapper installed on every
+connection (see `install_query_timer`). Outside of a request
+(management commands, background threads), these hooks do nothing.
+
+Process-wide histograms and counters are kept in memory and exposed in the
+Prometheus text format on `/metrics`. They are per process: with several
+worker processes, each one reports its own values.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from rest_framework.renderers import JSONRenderer
+
+
+# Latency buckets in seconds, from 1ms to 10s
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0)
+# Number of messages per model call
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+_current = ContextVar("request_metrics", default=None)
+
+
+class RequestMetrics:
+    """Durations and counts measured during one request.
+
+    Attributes:
+        durations (dict[str, float]): Seconds spent per kind of work.
+        counts (dict[str, int]): Number of queries, messages, etc.
+    """
+
+    __slots__ = ("durations", "counts", "_active")
+
+    def __init__(self):
+        self.durations = {}
+        self.counts = {}
+        self._active = set()
+
+    def add(self, name, seconds, count=0):
+        """Add `seconds` (and `count` items) to the `name` measurements."""
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+        if count:
+            self.counts[name] = self.counts.get(name, 0) + count
+
+    def server_timing(self, total):
+        """Format the measurements as a `Server-Timing` header value.
+
+        Args:
+            total (float): Seconds spent handling the whole request.
+
+        Returns:
+            str: e.g. `db;dur=3.1;desc="4 queries", total;dur=12.0`.
+        """
+        entries = []
+        for name, seconds in self.durations.items():
+            entry = f"{name};dur={seconds * 1000:.1f}"
+            if name in self.counts:
+                count = self.counts[name]
+                unit = UNITS[name][count != 1]
+                entry += f';desc="{count} {unit}"'
+            entries.append(entry)
+        entries.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(entries)
+
+
+# Unit (singular, plural) shown in the Server-Timing description of counts
+UNITS = {"db": ("query", "queries"), "inference": ("message", "messages")}
+
+
+def start_request():
+    """Start collecting the metrics of the current request.
+
+    Returns:
+        tuple[RequestMetrics, Token]: The new metrics and the token to pass
+        to `end_request`.
+    """
+    metrics = RequestMetrics()
+    return metrics, _current.set(metrics)
+
+
+def end_request(token):
+    """Stop collecting metrics for the request started with `token`."""
+    _current.reset(token)
+
+
+@contextmanager
+def measure(name, count=0):
+    """Add the time spent in the block to the current request's `name`.
+
+    Nested blocks with the same name are only counted once, so that e.g.
+    a serializer calling another serializer is not timed twice.
+
+    Args:
+        name (str): Kind of work, e.g. "serialization" or "inference".
+        count (int): Items processed by the block (e.g. messages).
+    """
+    metrics = _current.get()
+    if metrics is None or name in metrics._active:
+        yield
+        return
+    metrics._active.add(name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics._active.discard(name)
+        metrics.add(name, time.perf_counter() - started, count)
+
+
+def install_query_timer(sender, connection, **kwargs):
+    """Add `time_query` to the execute wrappers of a new DB connection.
+
+    Connected to `connection_created`. Installing the wrapper on every
+    connection, rather than per request, also covers the queries that
+    async requests run on `sync_to_async` threads, which have their own
+    connections.
+    """
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_query)
+
+
+def time_query(execute, sql, params, many, context):
+    """Database execute wrapper timing every query of the request."""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.add("db", time.perf_counter() - started, 1)
+
+
+class TimedSerializerMixin:
+    """Serializer mixin timing `.data` as the request's "serialization"."""
+
+    @property
+    def data(self):
+        with measure("serialization"):
+            return super().data
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """`JSONRenderer` timing the encoding as the request's
+    "serialization"."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with measure("serialization"):
+            return super().render(data, accepted_media_type,
+                                  renderer_context)
+
+
+def _format_labels(names, values, extra=""):
+    """Format Prometheus labels, e.g. `{endpoint="api/posts/"}`."""
+    labels = [f'{name}="{_escape(value)}"'
+              for name, value in zip(names, values)]
+    if extra:
+        labels.append(extra)
+    return "{" + ",".join(labels) + "}" if labels else ""
+
+
+def _escape(value):
+    """Escape a Prometheus label value."""
+    return (str(value).replace("\\", "\\\\").replace("\n", "\\n")
+            .replace('"', '\\"'))
+
+
+class Counter:
+    """Prometheus counter, optionally split by labels."""
+
+    type = "counter"
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+        self._function = None
+
+    def inc(self, amount=1, *labels):
+        """Add `amount` to the counter of the given label values."""
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def set_function(self, function):
+        """Read the counter from `function` on every scrape, like
+        `Gauge.set_function`, for totals already kept by another object."""
+        self._function = function
+
+    def samples(self):
+        """Yield the Prometheus sample lines of the counter."""
+        if self._function is not None:
+            values = self._function()
+            values = list(values.items() if isinstance(values, dict)
+                          else [((), values)])
+        else:
+            with self._lock:
+                values = list(self._values.items())
+        for labels, value in sorted(values):
+            yield f"{self.name}{_format_labels(self.labels, labels)} {value}"
+
+
+class Gauge:
+    """Prometheus gauge, read from a function when metrics are rendered.
+
+    Used for values owned by other objects (e.g. the length of a queue),
+    so that nothing has to be updated on the hot path.
+    """
+
+    type = "gauge"
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._function = None
+
+    def set_function(self, function):
+        """Read the gauge from `function` on every scrape.
+
+        Args:
+            function (callable): Returns a number, or a dict mapping tuples
+                of label values to numbers.
+        """
+        self._function = function
+
+    def samples(self):
+        """Yield the Prometheus sample lines of the gauge."""
+        if self._function is None:
+            return
+        values = self._function()
+        if not isinstance(values, dict):
+            values = {(): values}
+        for labels, value in sorted(values.items()):
+            yield f"{self.name}{_format_labels(self.labels, labels)} {value}"
+
+
+class Histogram:
+    """Prometheus histogram with fixed buckets, optionally split by labels.
+
+    Each observation costs one binary search and one locked update of a
+    small list, so histograms can be fed on every request.
+    """
+
+    type = "histogram"
+
+    def __init__(self, name, documentation, buckets, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.labels = tuple(labels)
+        # labels -> [count per bucket (+Inf last), sum]
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        """Record one observation for the given label values."""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1),
+                                                0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def samples(self):
+        """Yield the Prometheus sample lines of the histogram."""
+        with self._lock:
+            values = [(labels, list(counts), total)
+                      for labels, (counts, total) in self._values.items()]
+        for labels, counts, total in sorted(values):
+            cumulative = 0
+            bounds = [*(f"{bound:g}" for bound in self.buckets), "+Inf"]
+            for bound, bucket_count in zip(bounds, counts):
+                cumulative += bucket_count
+                label_text = _format_labels(self.labels, labels,
+                                            f'le="{bound}"')
+                yield f"{self.name}_bucket{label_text} {cumulative}"
+            label_text = _format_labels(self.labels, labels)
+            yield f"{self.name}_sum{label_text} {total:.6f}"
+            yield f"{self.name}_count{label_text} {cumulative}"
+
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time spent handling requests, per endpoint.",
+    LATENCY_BUCKETS, labels=("endpoint", "method"),
+)
+REQUESTS = Counter(
+    "http_requests_total",
+    "Requests handled, per endpoint and status code.",
+    labels=("endpoint", "method", "status"),
+)
+REQUEST_WORK = Counter(
+    "http_request_work_seconds_total",
+    "Time spent in the database, inference and serialization, per "
+    "endpoint.",
+    labels=("endpoint", "kind"),
+)
+DB_QUERIES = Counter(
+    "http_request_db_queries_total",
+    "Database queries run by requests, per endpoint.",
+    labels=("endpoint",),
+)
+INFERENCE_DURATION = Histogram(
+    "satisfaction_inference_seconds",
+    "Time spent in each sentiment model call.",
+    LATENCY_BUCKETS,
+)
+INFERENCE_BATCH_SIZE = Histogram(
+    "satisfaction_inference_batch_size",
+    "Number of messages per sentiment model call.",
+    BATCH_SIZE_BUCKETS,
+)
+MICRO_BATCH_SIZE = Histogram(
+    "satisfaction_micro_batch_size",
+    "Number of messages per micro-batch.",
+    BATCH_SIZE_BUCKETS,
+)
+MICRO_BATCH_QUEUE_DEPTH = Gauge(
+    "satisfaction_micro_batch_queue_depth",
+    "Messages waiting for the next micro-batch.",
+)
+CACHE_LOOKUPS = Counter(
+    "satisfaction_cache_lookups_total",
+    "Prediction cache lookups, by result (hit or miss).",
+    labels=("result",),
+)
+CACHE_ENTRIES = Gauge(
+    "satisfaction_cache_entries",
+    "Predictions currently held in the cache.",
+)
+EXECUTOR_IN_FLIGHT = Gauge(
+    "satisfaction_executor_in_flight",
+    "Messages running or waiting on the inference executor.",
+)
+EXECUTOR_QUEUE_DEPTH = Gauge(
+    "satisfaction_executor_queue_depth",
+    "Messages waiting for an inference executor thread.",
+)
+EXECUTOR_REJECTED = Counter(
+    "satisfaction_executor_rejected_total",
+    "Messages refused (503) because the inference executor was full.",
+)
+
+REGISTRY = [REQUEST_DURATION, REQUESTS, REQUEST_WORK, DB_QUERIES,
+            INFERENCE_DURATION, INFERENCE_BATCH_SIZE, MICRO_BATCH_SIZE,
+            MICRO_BATCH_QUEUE_DEPTH, CACHE_LOOKUPS, CACHE_ENTRIES,
+            EXECUTOR_IN_FLIGHT, EXECUTOR_QUEUE_DEPTH, EXECUTOR_REJECTED]
+
+
+def record_request(endpoint, method, status, total, metrics):
+    """Aggregate the metrics of a finished request.
+
+    Args:
+        endpoint (str): The URL pattern of the view, e.g.
+            "api/posts/<slug:slug>/".
+        method (str): The HTTP method.
+        status (int): The response status code.
+        total (float): Seconds spent handling the request.
+        metrics (RequestMetrics): The request's measurements.
+    """
+    REQUEST_DURATION.observe(total, endpoint, method)
+    REQUESTS.inc(1, endpoint, method, str(status))
+    for kind, seconds in metrics.durations.items():
+        REQUEST_WORK.inc(seconds, endpoint, kind)
+    if "db" in metrics.counts:
+        DB_QUERIES.inc(metrics.counts["db"], endpoint)
+
+
+def record_inference(seconds, batch_size):
+    """Record one sentiment model call, from any thread."""
+    INFERENCE_DURATION.observe(seconds)
+    INFERENCE_BATCH_SIZE.observe(batch_size)
+
+
+def record_micro_batch(batch_size):
+    """Record one micro-batch collected by the `BatchScheduler`."""
+    MICRO_BATCH_SIZE.observe(batch_size)
+
+
+def render():
+    """Return every metric in the Prometheus text exposition format."""
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        lines.extend(metric.samples())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,71 @@
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .metrics import end_request, record_request, start_request
+
+
+class RequestMetricsMiddleware:
+    """
+    Measure every request and report where its time went.
+
+    For each request, database queries are counted and timed by the
+    execute wrapper of `install_query_timer`, and the `measure()` hooks
+    add the time spent in
+    sentiment inference and DRF serialization. The measurements are sent
+    back in a `Server-Timing` header, e.g.
+    `db;dur=3.1;desc="4 queries", serialization;dur=1.2, total;dur=9.8`,
+    and aggregated per endpoint (URL pattern) into the histograms served on
+    `/metrics`.
+
+    Disabled by the `METRICS_ENABLED` setting. Must come first in
+    `MIDDLEWARE`, so that the total includes the other middleware.
+
+    Supports both sync and async requests, so that it does not force async
+    views (under ASGI) through a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+
+        metrics, token = start_request()
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            end_request(token)
+        return self._finish(request, response, metrics, started)
+
+    async def __acall__(self, request):
+        if not settings.METRICS_ENABLED:
+            return await self.get_response(request)
+
+        metrics, token = start_request()
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            end_request(token)
+        return self._finish(request, response, metrics, started)
+
+    def _finish(self, request, response, metrics, started):
+        """Record the request's metrics and add the Server-Timing header."""
+        total = time.perf_counter() - started
+        match = request.resolver_match
+        endpoint = match.route if match else "unmatched"
+        record_request(endpoint, request.method, response.status_code,
+                       total, metrics)
+        if settings.METRICS_SERVER_TIMING:
+            response["Server-Timing"] = metrics.server_timing(total)
+        return response
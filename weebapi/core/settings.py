@@ -37,21 +37,42 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'core',
     'blog',
     'contact',
     'satisfaction',
     'rest_framework',
     'corsheaders',
 ]
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Rendered blog responses (see blog.caching). Past MAX_ENTRIES, the
+    # least recently used entries are evicted.
+    "blog": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "blog-responses",
+        "OPTIONS": {"MAX_ENTRIES": 2000},
+    },
+}
+
 REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 6,
+    # JSONRenderer that reports its time in the Server-Timing header
+    "DEFAULT_RENDERER_CLASSES": [
+        "core.metrics.TimedJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.AllowAny",
     ],
 }
 
 MIDDLEWARE = [
+    "core.middleware.RequestMetricsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
     'django.middleware.security.SecurityMiddleware',
@@ -140,3 +161,101 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Satisfaction (sentiment analysis)
+
+# Maximum number of messages accepted by /api/satisfaction/batch/
+SATISFACTION_BATCH_MAX_SIZE = 1000
+
+# Merge concurrent single-message predictions into one model call.
+# A batch is closed after SATISFACTION_MICRO_BATCH_WAIT seconds or once
+# SATISFACTION_MICRO_BATCH_MAX_SIZE messages have been collected.
+SATISFACTION_MICRO_BATCHING = False
+SATISFACTION_MICRO_BATCH_WAIT = 0.005
+SATISFACTION_MICRO_BATCH_MAX_SIZE = 64
+
+# Maximum number of predictions kept in the in-process LRU cache
+# (0 disables the cache).
+SATISFACTION_CACHE_SIZE = 10000
+
+# Memory-map the uncompressed model copy created by `export_mmap_model`
+# (when it exists), so that worker processes share its arrays.
+SATISFACTION_MODEL_MMAP = True
+
+# Use the flat-array forest created by `export_flat_forest` (when it
+# exists) instead of the sklearn pipeline.
+SATISFACTION_FLAT_FOREST = True
+
+# Serve /api/satisfaction/ with an async view that runs inference on a
+# dedicated pool of SATISFACTION_EXECUTOR_WORKERS threads, instead of on
+# the request worker. At most SATISFACTION_EXECUTOR_QUEUE_SIZE more
+# messages may wait for the pool; beyond that, requests get a 503 with a
+# Retry-After of SATISFACTION_RETRY_AFTER seconds. Meant for ASGI servers
+# (under WSGI, the view works but each request runs its own event loop).
+SATISFACTION_ASYNC_VIEW = True
+SATISFACTION_EXECUTOR_WORKERS = 2
+SATISFACTION_EXECUTOR_QUEUE_SIZE = 32
+SATISFACTION_RETRY_AFTER = 1
+
+# Where the sentiment model runs: "local" runs it in the thread handling the
+# request, "process" sends the messages to a pool of
+# SATISFACTION_INFERENCE_PROCESSES long-lived worker processes that each
+# load the model once, so that model calls from concurrent threads run in
+# parallel instead of contending for the GIL. Every server worker process
+# starts its own pool, and each pool process holds a model (shared pages
+# only with SATISFACTION_MODEL_MMAP), so keep the total (server workers x
+# SATISFACTION_INFERENCE_PROCESSES) around the number of cores. A worker
+# that does not answer within SATISFACTION_INFERENCE_TIMEOUT seconds is
+# killed and replaced. With the async view, give the executor at least as
+# many threads as there are processes.
+SATISFACTION_INFERENCE_BACKEND = "local"
+SATISFACTION_INFERENCE_PROCESSES = 2
+SATISFACTION_INFERENCE_TIMEOUT = 30
+
+# Score every message with the linear model first, and only send it to the
+# forest when the linear probability of "Positive" is inside the band.
+SATISFACTION_CASCADE = False
+SATISFACTION_CASCADE_BAND = (0.35, 0.65)
+
+
+# Contact
+
+# Save contacts with satisfaction=NULL and score them on a background
+# thread, instead of running inference during Contact.save().
+CONTACT_ASYNC_SCORING = False
+# Number of pending contacts scored per model call by the background worker
+CONTACT_SCORING_BATCH_SIZE = 500
+# Maximum number of contacts accepted by /api/contact/bulk/
+CONTACT_BULK_MAX_SIZE = 1000
+
+
+# Blog
+
+# "fts" uses the SQLite FTS5 index for ?q= searches (when available),
+# "icontains" always uses LIKE lookups.
+BLOG_SEARCH_BACKEND = "fts"
+
+# Cache the anonymous JSON GET responses of the post endpoints (with
+# ETag/Last-Modified and 304 support) in the BLOG_RESPONSE_CACHE_ALIAS
+# cache, for BLOG_RESPONSE_CACHE_TIMEOUT seconds at most. The cache is
+# invalidated on every post write, through a version stored in that cache:
+# only enable it with a single process, or after pointing CACHES["blog"] at
+# a backend shared by every worker (LocMemCache is per process, so the
+# other workers would keep serving stale responses and 304s).
+BLOG_RESPONSE_CACHE = False
+BLOG_RESPONSE_CACHE_ALIAS = "blog"
+BLOG_RESPONSE_CACHE_TIMEOUT = 60
+
+
+# Metrics
+
+# Measure every request (DB queries, inference, serialization, total time)
+# and serve per-endpoint histograms on /metrics, in the Prometheus format.
+# Metrics are kept per process.
+METRICS_ENABLED = True
+# Also report the measurements in a Server-Timing response header
+METRICS_SERVER_TIMING = True
+# Client addresses or networks (CIDR) allowed to read /metrics; the others
+# get a 404. Behind a reverse proxy, REMOTE_ADDR is the proxy's address.
+METRICS_ALLOWED_IPS = ["127.0.0.1", "::1"]
@@ -0,0 +1,49 @@
+import ipaddress
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+
+from .metrics import render
+
+
+def is_metrics_client(address):
+    """Return True if `address` is allowed by `METRICS_ALLOWED_IPS`.
+
+    Args:
+        address (str): The client IP address (`REMOTE_ADDR`).
+
+    Returns:
+        bool: Whether the address is in one of the allowed networks.
+    """
+    try:
+        address = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(address in ipaddress.ip_network(allowed, strict=False)
+               for allowed in settings.METRICS_ALLOWED_IPS)
+
+
+def metrics(request):
+    """
+    Serve the process metrics in the Prometheus text format.
+
+    Includes the per-endpoint latency histograms, request counts and
+    database/inference/serialization time collected by
+    `RequestMetricsMiddleware`, and the sentiment inference and
+    micro-batching metrics. Only served to the addresses listed in
+    `METRICS_ALLOWED_IPS`, since the endpoint names and the load of the
+    server are not meant for anonymous clients.
+
+    Args:
+        request (HttpRequest): The scrape request.
+
+    Returns:
+        HttpResponse: The metrics, or 404 when `METRICS_ENABLED` is off or
+        the client is not allowed.
+    """
+    if (not settings.METRICS_ENABLED
+            or not is_metrics_client(request.META.get("REMOTE_ADDR", ""))):
+        raise Http404
+    return HttpResponse(render(),
+                        content_type="text/plain; version=0.0.4; "
+                                     "charset=utf-8")
@@ -0,0 +1,138 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from core.metrics import record_micro_batch
+
+
+class BatchScheduler:
+    """Merge concurrent single-message predictions into vectorized batches.
+
+    Callers submit one message at a time from any thread. A background
+    worker thread waits for the first message, then keeps collecting
+    messages for at most `max_wait` seconds (or until `max_batch_size`
+    messages are collected), runs `predict_many` once on the whole batch,
+    and hands each caller its own result. The size of every batch is
+    recorded in the `satisfaction_micro_batch_size` histogram served on
+    `/metrics`.
+
+    Attributes:
+        predict_many (callable): Function taking a list of messages and
+            returning one result per message, in the same order.
+        max_wait (float): Maximum time, in seconds, to wait for more
+            messages once a batch has started.
+        max_batch_size (int): Maximum number of messages per batch.
+    """
+
+    def __init__(self, predict_many, max_wait=0.005, max_batch_size=64):
+        self.predict_many = predict_many
+        self.max_wait = max_wait
+        self.max_batch_size = max_batch_size
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+        self._batches = 0
+        self._messages = 0
+        self._last_batch_size = 0
+        self._largest_batch_size = 0
+
+    def submit(self, message):
+        """Queue a message and return a future for its result.
+
+        Args:
+            message (str): The message to analyze.
+
+        Returns:
+            Future: Resolved with the result for this message once its batch
+            has been processed.
+        """
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((message, future))
+        return future
+
+    def predict(self, message):
+        """Queue a message and block until its result is available.
+
+        Args:
+            message (str): The message to analyze.
+
+        Returns:
+            The result returned by `predict_many` for this message.
+        """
+        return self.submit(message).result()
+
+    def metrics(self):
+        """Return queue and batch size statistics.
+
+        Returns:
+            dict: A dictionary containing:
+                - queue_depth (int): Messages waiting to be batched.
+                - batches (int): Number of batches processed.
+                - messages (int): Number of messages processed.
+                - last_batch_size (int): Size of the most recent batch.
+                - largest_batch_size (int): Size of the largest batch.
+                - mean_batch_size (float): Average number of messages
+                  per batch.
+        """
+        with self._lock:
+            batches = self._batches
+            messages = self._messages
+            return {
+                "queue_depth": self._queue.qsize(),
+                "batches": batches,
+                "messages": messages,
+                "last_batch_size": self._last_batch_size,
+                "largest_batch_size": self._largest_batch_size,
+                "mean_batch_size": messages / batches if batches else 0.0,
+            }
+
+    def _ensure_worker(self):
+        """Start the background worker thread if it is not running."""
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="satisfaction-batcher",
+                    daemon=True
+                )
+                self._worker.start()
+
+    def _collect(self):
+        """Block for the first message, then gather a full batch."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        """Worker loop: collect a batch, predict it, resolve the futures."""
+        while True:
+            batch = self._collect()
+            messages = [message for message, _ in batch]
+            try:
+                results = self.predict_many(messages)
+            except Exception as exc:
+                for _, future in batch:
+                    future.set_exception(exc)
+            else:
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+
+            record_micro_batch(len(batch))
+            with self._lock:
+                self._batches += 1
+                self._messages += len(batch)
+                self._last_batch_size = len(batch)
+                self._largest_batch_size = max(
+                    self._largest_batch_size, len(batch)
+                )
@@ -0,0 +1,111 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def normalize_message(message):
+    """Collapse whitespace and lowercase a message.
+
+    The TF-IDF vectorizer lowercases its input and ignores whitespace when
+    tokenizing, so messages that only differ in case or spacing always get
+    the same prediction.
+
+    Args:
+        message (str): The raw message.
+
+    Returns:
+        str: The normalized message.
+    """
+    return " ".join(message.split()).lower()
+
+
+def cache_key(message):
+    """Return the cache key for a message.
+
+    Args:
+        message (str): The raw message.
+
+    Returns:
+        bytes: A hash of the normalized message.
+    """
+    normalized = normalize_message(message).encode("utf-8")
+    return hashlib.blake2b(normalized, digest_size=16).digest()
+
+
+class ResultCache:
+    """Bounded, thread-safe LRU cache of sentiment predictions.
+
+    Entries are keyed on a hash of the normalized message, so the cache
+    does not keep the message text itself. Once `max_size` entries are
+    stored, the least recently used entry is evicted.
+
+    Attributes:
+        max_size (int): Maximum number of entries. 0 disables the cache.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that were not in the cache.
+    """
+
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, message):
+        """Look up the cached prediction for a message.
+
+        Args:
+            message (str): The raw message.
+
+        Returns:
+            The cached prediction, or None if the message is not cached.
+        """
+        if not self.max_size:
+            return None
+        key = cache_key(message)
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, message, value):
+        """Store the prediction for a message, evicting old entries.
+
+        Args:
+            message (str): The raw message.
+            value: The prediction to cache.
+        """
+        if not self.max_size:
+            return
+        key = cache_key(message)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove every entry, e.g. after the model has changed."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return hit/miss counters and the current cache size.
+
+        Returns:
+            dict: A dictionary containing `hits`, `misses`, `size` and
+            `max_size`.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+            }
@@ -0,0 +1,90 @@
+import threading
+
+import numpy as np
+
+
+class CascadeModel:
+    """Linear model first, Random Forest only for uncertain messages.
+
+    Every message is scored by the cheap TF-IDF + Logistic Regression
+    model. When its probability of the "Positive" class falls inside the
+    `[low, high]` uncertainty band, the message is sent to the forest,
+    whose prediction wins. Confident linear predictions are returned as is.
+
+    Attributes:
+        linear (Pipeline): The TF-IDF + Logistic Regression pipeline.
+        forest (Pipeline | FlatForestPipeline): The TF-IDF + Random Forest
+            model.
+        low (float): Lower bound of the uncertainty band.
+        high (float): Upper bound of the uncertainty band.
+        messages (int): Number of messages scored so far.
+        forwarded (int): Number of those messages sent to the forest.
+    """
+
+    def __init__(self, linear, forest, low=0.35, high=0.65):
+        self.linear = linear
+        self.forest = forest
+        self.low = low
+        self.high = high
+        self.messages = 0
+        self.forwarded = 0
+        self._lock = threading.Lock()
+
+    @property
+    def classes_(self):
+        """ndarray: Class labels, like `Pipeline.classes_`."""
+        return self.linear.classes_
+
+    def route(self, messages):
+        """Predict labels and report which messages reached the forest.
+
+        Args:
+            messages (list[str]): The messages to classify.
+
+        Returns:
+            tuple[ndarray, ndarray]: The predicted labels, and a boolean
+            mask that is True for messages scored by the forest.
+        """
+        proba = self.linear.predict_proba(messages)
+        labels = np.asarray(self.linear.classes_, dtype=object).take(
+            np.argmax(proba, axis=1)
+        )
+
+        positive = proba[:, list(self.linear.classes_).index("Positive")]
+        uncertain = (positive >= self.low) & (positive <= self.high)
+        if uncertain.any():
+            labels[uncertain] = self.forest.predict(
+                [message for message, flag in zip(messages, uncertain)
+                 if flag]
+            )
+
+        with self._lock:
+            self.messages += len(messages)
+            self.forwarded += int(uncertain.sum())
+        return labels, uncertain
+
+    def predict(self, messages):
+        """Predict labels for raw messages.
+
+        Args:
+            messages (list[str]): The messages to classify.
+
+        Returns:
+            ndarray: The predicted labels.
+        """
+        return self.route(messages)[0]
+
+    def stats(self):
+        """Return how many messages were scored and forwarded to the forest.
+
+        Returns:
+            dict: A dictionary containing `messages`, `forwarded` and
+            `forest_share`.
+        """
+        with self._lock:
+            return {
+                "messages": self.messages,
+                "forwarded": self.forwarded,
+                "forest_share": (self.forwarded / self.messages
+                                 if self.messages else 0.0),
+            }
@@ -0,0 +1,90 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ExecutorSaturated(Exception):
+    """Raised when an `InferenceExecutor` has no room for another task."""
+
+
+class InferenceExecutor:
+    """Bounded pool running CPU-bound inference off the request workers.
+
+    Tasks run on `workers` dedicated threads, sized independently from the
+    server's request workers. At most `workers + queue_size` tasks are
+    admitted at a time (running or waiting); `submit` refuses more with
+    `ExecutorSaturated` instead of queueing without limit, so callers can
+    shed load (e.g. answer 503) while the requests already admitted keep a
+    bounded latency.
+
+    Attributes:
+        workers (int): Number of threads running tasks.
+        queue_size (int): Number of admitted tasks that may wait for a
+            thread.
+    """
+
+    def __init__(self, workers=2, queue_size=32):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="satisfaction-inference"
+        )
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._rejected = 0
+
+    def submit(self, fn, *args):
+        """Run `fn(*args)` on the pool, if there is room for it.
+
+        Args:
+            fn (callable): The task.
+            *args: Arguments passed to `fn`.
+
+        Returns:
+            Future: Resolved with the result of `fn`.
+
+        Raises:
+            ExecutorSaturated: If `workers + queue_size` tasks are already
+                running or waiting.
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise ExecutorSaturated()
+        with self._lock:
+            self._in_flight += 1
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def metrics(self):
+        """Return load statistics.
+
+        Returns:
+            dict: A dictionary containing:
+                - in_flight (int): Tasks running or waiting.
+                - queue_depth (int): Tasks waiting for a thread.
+                - capacity (int): Maximum number of admitted tasks.
+                - rejected (int): Tasks refused since startup.
+        """
+        with self._lock:
+            return {
+                "in_flight": self._in_flight,
+                "queue_depth": max(0, self._in_flight - self.workers),
+                "capacity": self.workers + self.queue_size,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self, wait=True):
+        """Stop the worker threads once the admitted tasks are done."""
+        self._executor.shutdown(wait=wait)
+
+    def _release(self, future=None):
+        """Free the slot of a finished task."""
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
@@ -0,0 +1,247 @@
+import random
+
+import numpy as np
+
+
+# Upper bound on the size of the dense feature block built per chunk of
+# rows (number of float32 cells, i.e. 16 MiB).
+_CHUNK_CELLS = 1 << 22
+
+
+class FlatForest:
+    """Random Forest compiled to flat, contiguous node arrays.
+
+    Every tree of a fitted `RandomForestClassifier` is concatenated into a
+    single set of node arrays, and `roots` holds the index of each tree's
+    root node. Prediction walks all trees for all rows at once, one tree
+    level per numpy step, instead of going through sklearn's per-tree
+    Python dispatch.
+
+    Only the features referenced by at least one split are kept: they are
+    renumbered `0..len(used_features) - 1`, so each chunk of rows is
+    evaluated against a small dense block instead of the full vocabulary.
+
+    The arrays are plain numpy arrays, so a `FlatForest` saved with
+    `joblib.dump(..., compress=0)` can be memory-mapped and shared between
+    processes.
+
+    Attributes:
+        classes (ndarray): Class labels, in the forest's order.
+        used_features (ndarray): Original indices of the referenced
+            features, sorted.
+        feature (ndarray): Renumbered split feature of each node (0 for
+            leaves).
+        threshold (ndarray): Split threshold of each node.
+        left (ndarray): Left child of each node (-1 for leaves).
+        right (ndarray): Right child of each node (-1 for leaves).
+        value (ndarray): Normalized class probabilities of each node.
+        roots (ndarray): Root node index of each tree.
+    """
+
+    def __init__(self, classes, used_features, feature, threshold, left,
+                 right, value, roots):
+        self.classes = classes
+        self.used_features = used_features
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+
+    @classmethod
+    def from_sklearn(cls, forest):
+        """Compile a fitted `RandomForestClassifier`.
+
+        Args:
+            forest (RandomForestClassifier): The fitted forest.
+
+        Returns:
+            FlatForest: The compiled forest.
+        """
+        features, thresholds, lefts, rights, values, roots = (
+            [], [], [], [], [], []
+        )
+        offset = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            is_leaf = tree.children_left == -1
+            roots.append(offset)
+            features.append(np.where(is_leaf, -1, tree.feature))
+            thresholds.append(tree.threshold)
+            lefts.append(np.where(is_leaf, -1, tree.children_left + offset))
+            rights.append(np.where(is_leaf, -1, tree.children_right + offset))
+
+            # Same normalization as DecisionTreeClassifier.predict_proba
+            value = tree.value[:, 0, :forest.n_classes_].astype(np.float64)
+            normalizer = value.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            values.append(value / normalizer)
+            offset += tree.node_count
+
+        feature = np.concatenate(features)
+        used_features = np.unique(feature[feature >= 0])
+        local_feature = np.where(
+            feature >= 0, np.searchsorted(used_features, feature), 0
+        )
+        return cls(
+            classes=np.asarray(forest.classes_),
+            used_features=used_features.astype(np.int64),
+            feature=np.ascontiguousarray(local_feature, dtype=np.intp),
+            threshold=np.ascontiguousarray(
+                np.concatenate(thresholds), dtype=np.float64
+            ),
+            left=np.ascontiguousarray(np.concatenate(lefts), dtype=np.intp),
+            right=np.ascontiguousarray(np.concatenate(rights), dtype=np.intp),
+            value=np.ascontiguousarray(np.concatenate(values)),
+            roots=np.asarray(roots, dtype=np.intp),
+        )
+
+    @property
+    def n_estimators(self):
+        """int: Number of trees in the forest."""
+        return len(self.roots)
+
+    def predict_proba(self, X):
+        """Predict class probabilities for a sparse feature matrix.
+
+        Args:
+            X (scipy.sparse matrix): TF-IDF features, one row per message.
+
+        Returns:
+            ndarray: Array of shape (n_samples, n_classes).
+        """
+        X = X.tocsr()
+        columns = self._columns(X.shape[1])
+        proba = np.empty((X.shape[0], len(self.classes)), dtype=np.float64)
+        chunk = max(1, _CHUNK_CELLS // max(1, len(self.used_features)))
+        for start in range(0, X.shape[0], chunk):
+            rows = X[start:start + chunk]
+            proba[start:start + chunk] = self._predict_dense(
+                self._densify(rows, columns)
+            )
+        return proba
+
+    def predict(self, X):
+        """Predict class labels for a sparse feature matrix.
+
+        Args:
+            X (scipy.sparse matrix): TF-IDF features, one row per message.
+
+        Returns:
+            ndarray: Predicted label of each row.
+        """
+        return self.classes.take(np.argmax(self.predict_proba(X), axis=1))
+
+    def _columns(self, n_features):
+        """Map every original feature to its renumbered column (or -1)."""
+        columns = getattr(self, "_column_map", None)
+        if columns is None or len(columns) != n_features:
+            columns = np.full(n_features, -1, dtype=np.intp)
+            columns[self.used_features] = np.arange(len(self.used_features))
+            self._column_map = columns
+        return columns
+
+    def _densify(self, rows, columns):
+        """Build the dense (rows, used features) block for a CSR chunk."""
+        # sklearn evaluates splits on float32 inputs, so do the same to get
+        # exactly the same comparisons.
+        dense = np.zeros((rows.shape[0], len(self.used_features)),
+                         dtype=np.float32)
+        row_index = np.repeat(np.arange(rows.shape[0]), np.diff(rows.indptr))
+        column_index = columns[rows.indices]
+        kept = column_index >= 0
+        dense[row_index[kept], column_index[kept]] = rows.data[kept]
+        return dense
+
+    def _predict_dense(self, dense):
+        """Walk every tree for every row of a dense block."""
+        n_samples = dense.shape[0]
+        # One entry per (row, tree) pair, holding the current node
+        nodes = np.tile(self.roots, n_samples)
+        samples = np.repeat(np.arange(n_samples), self.n_estimators)
+
+        # Advance the pairs that have not reached a leaf, one level at a time
+        pending = np.flatnonzero(self.left[nodes] != -1)
+        while pending.size:
+            current = nodes[pending]
+            x = dense[samples[pending], self.feature[current]]
+            current = np.where(x <= self.threshold[current],
+                               self.left[current], self.right[current])
+            nodes[pending] = current
+            pending = pending[self.left[current] != -1]
+
+        # Sum tree by tree in order (cumsum is sequential, unlike sum), like
+        # RandomForestClassifier.predict_proba, to get the same rounding.
+        leaves = self.value[nodes.reshape(n_samples, self.n_estimators)]
+        proba = np.cumsum(leaves, axis=1)[:, -1]
+        proba /= self.n_estimators
+        return proba
+
+
+class FlatForestPipeline:
+    """TF-IDF vectorizer followed by a `FlatForest`.
+
+    Drop-in replacement for the sklearn `Pipeline` shipped in
+    `sentiment_model.joblib`, exposing the same `predict` and
+    `predict_proba` methods on raw messages.
+
+    Attributes:
+        vectorizer (TfidfVectorizer): The fitted vectorizer.
+        forest (FlatForest): The compiled forest.
+    """
+
+    def __init__(self, vectorizer, forest):
+        self.vectorizer = vectorizer
+        self.forest = forest
+
+    @classmethod
+    def from_sklearn(cls, pipeline):
+        """Compile a fitted TF-IDF + Random Forest `Pipeline`.
+
+        Args:
+            pipeline (Pipeline): The fitted pipeline.
+
+        Returns:
+            FlatForestPipeline: The compiled pipeline.
+        """
+        return cls(pipeline.steps[0][1],
+                   FlatForest.from_sklearn(pipeline.steps[-1][1]))
+
+    @property
+    def classes_(self):
+        """ndarray: Class labels, like `Pipeline.classes_`."""
+        return self.forest.classes
+
+    def predict_proba(self, messages):
+        """Predict class probabilities for raw messages."""
+        return self.forest.predict_proba(self.vectorizer.transform(messages))
+
+    def predict(self, messages):
+        """Predict labels for raw messages."""
+        return self.forest.predict(self.vectorizer.transform(messages))
+
+
+def synthetic_messages(vectorizer, count, min_words=1, max_words=30, seed=0):
+    """Generate random messages from a vectorizer's vocabulary.
+
+    Used to compare the compiled forest with the sklearn model without any
+    dataset at hand.
+
+    Args:
+        vectorizer (TfidfVectorizer): The fitted vectorizer.
+        count (int): Number of messages to generate.
+        min_words (int): Minimum number of vocabulary terms per message.
+        max_words (int): Maximum number of vocabulary terms per message.
+        seed (int): Random seed, for reproducible samples.
+
+    Returns:
+        list[str]: The generated messages.
+    """
+    rng = random.Random(seed)
+    vocabulary = sorted(vectorizer.vocabulary_)
+    return [
+        " ".join(rng.choices(vocabulary,
+                             k=rng.randint(min_words, max_words)))
+        for _ in range(count)
+    ]
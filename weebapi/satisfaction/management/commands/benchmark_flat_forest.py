@@ -0,0 +1,73 @@
+import time
+
+import joblib
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from satisfaction.forest import FlatForestPipeline, synthetic_messages
+from satisfaction.satisfaction import MODEL_PATH
+
+
+class Command(BaseCommand):
+    """
+    Compare the latency of the compiled forest with the sklearn model.
+
+    Both models are built from `MODEL_PATH` and run on the same synthetic
+    messages. The command reports p50/p99 latency for single-message calls
+    and the time of one batched call, and fails if any prediction differs.
+
+    Usage:
+        python manage.py benchmark_flat_forest
+        python manage.py benchmark_flat_forest --messages 2000 --batch 5000
+    """
+
+    help = "Benchmark the flat-array forest against the sklearn model."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--messages",
+            type=int,
+            default=500,
+            help="Number of single-message calls per model "
+                 "(default: %(default)s).",
+        )
+        parser.add_argument(
+            "--batch",
+            type=int,
+            default=1000,
+            help="Number of messages in the batched call "
+                 "(default: %(default)s).",
+        )
+
+    def handle(self, *args, **options):
+        pipeline = joblib.load(MODEL_PATH)
+        compiled = FlatForestPipeline.from_sklearn(pipeline)
+        messages = synthetic_messages(compiled.vectorizer, options["messages"])
+        batch = synthetic_messages(compiled.vectorizer, options["batch"],
+                                   seed=1)
+
+        for name, model in (("sklearn", pipeline), ("flat", compiled)):
+            # Warm up, so one-off initialization is not measured
+            model.predict(messages[:10])
+
+            latencies = []
+            for message in messages:
+                start = time.perf_counter()
+                model.predict([message])
+                latencies.append(time.perf_counter() - start)
+            p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+
+            start = time.perf_counter()
+            model.predict(batch)
+            batch_time = time.perf_counter() - start
+
+            self.stdout.write(
+                f"{name:8} single p50={p50:.3f}ms p99={p99:.3f}ms | "
+                f"batch of {len(batch)}: {batch_time * 1000:.1f}ms "
+                f"({len(batch) / batch_time:.0f} msg/s)"
+            )
+
+        if not np.array_equal(pipeline.predict_proba(messages + batch),
+                              compiled.predict_proba(messages + batch)):
+            raise CommandError("Predictions differ between the two models.")
+        self.stdout.write(self.style.SUCCESS("Predictions identical."))
@@ -0,0 +1,73 @@
+import time
+
+import joblib
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from sklearn.metrics import accuracy_score
+
+from satisfaction.cascade import CascadeModel
+from satisfaction.satisfaction import LINEAR_MODEL_PATH, MODEL_PATH
+from satisfaction.training import load_dataset, split_dataset
+
+
+class Command(BaseCommand):
+    """
+    Evaluate the cascade mode on the test split of a dataset.
+
+    Uses the same split as `train_sentiment_models`, so the models are
+    evaluated on messages they were not trained on. Reports the accuracy
+    and time of the linear model, the forest and the cascade, and the share
+    of messages the cascade sends to the forest for each uncertainty band.
+
+    Usage:
+        python manage.py evaluate_cascade twitter_training.csv
+        python manage.py evaluate_cascade data.csv --band 0.3 0.7 \\
+            --band 0.4 0.6
+    """
+
+    help = "Report accuracy and forest share of the cascade mode."
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", help="Path to the evaluation CSV.")
+        parser.add_argument(
+            "--band",
+            nargs=2,
+            type=float,
+            action="append",
+            metavar=("LOW", "HIGH"),
+            help="Uncertainty band to evaluate (repeatable, default: "
+                 "the SATISFACTION_CASCADE_BAND setting).",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            linear = joblib.load(LINEAR_MODEL_PATH)
+        except FileNotFoundError:
+            raise CommandError(
+                f"{LINEAR_MODEL_PATH} not found, run "
+                f"`train_sentiment_models` first."
+            )
+        forest = joblib.load(MODEL_PATH)
+
+        messages, labels = load_dataset(options["dataset"])
+        _, X_test, _, y_test = split_dataset(messages, labels)
+
+        for name, model in (("linear", linear), ("forest", forest)):
+            start = time.perf_counter()
+            predictions = model.predict(X_test)
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f"{name:8} accuracy={accuracy_score(y_test, predictions):.4f}"
+                f" time={elapsed:.2f}s"
+            )
+
+        for low, high in options["band"] or [settings.SATISFACTION_CASCADE_BAND]:
+            cascade = CascadeModel(linear, forest, low, high)
+            start = time.perf_counter()
+            predictions, forwarded = cascade.route(X_test)
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f"cascade [{low:.2f}, {high:.2f}] "
+                f"accuracy={accuracy_score(y_test, list(predictions)):.4f} "
+                f"forest_share={forwarded.mean():.2%} time={elapsed:.2f}s"
+            )
@@ -0,0 +1,83 @@
+import os
+
+import joblib
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from satisfaction.forest import FlatForestPipeline, synthetic_messages
+from satisfaction.satisfaction import (
+    FLAT_MODEL_PATH,
+    MODEL_PATH,
+    file_digest,
+)
+
+
+class Command(BaseCommand):
+    """
+    Compile the sentiment model's forest into flat node arrays.
+
+    Reads the sklearn pipeline from `MODEL_PATH`, converts its Random
+    Forest into a `FlatForest` and writes the result, uncompressed so that
+    it can be memory-mapped, to `FLAT_MODEL_PATH`.
+
+    Before writing, predictions of both models are compared on synthetic
+    messages built from the vectorizer vocabulary; the export is aborted if
+    a single probability differs.
+
+    The compiled model records the version of the model it was made from,
+    and `load_model()` ignores it once `sentiment_model.joblib` is
+    replaced, so run the command again every time the model changes
+    (`train_sentiment_models` does it).
+
+    Usage:
+        python manage.py export_flat_forest
+        python manage.py export_flat_forest --verify 5000
+    """
+
+    help = "Compile the sentiment forest into flat, mmap-able node arrays."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=FLAT_MODEL_PATH,
+            help="Destination file (default: %(default)s).",
+        )
+        parser.add_argument(
+            "--verify",
+            type=int,
+            default=1000,
+            help="Number of synthetic messages used to check that "
+                 "predictions are identical (default: %(default)s).",
+        )
+
+    def handle(self, *args, **options):
+        output = options["output"]
+        pipeline = joblib.load(MODEL_PATH)
+        compiled = FlatForestPipeline.from_sklearn(pipeline)
+        compiled.source_version = file_digest([MODEL_PATH])
+
+        if options["verify"]:
+            messages = synthetic_messages(compiled.vectorizer,
+                                          options["verify"])
+            expected = pipeline.predict_proba(messages)
+            actual = compiled.predict_proba(messages)
+            if not np.array_equal(expected, actual):
+                raise CommandError(
+                    "Compiled forest predictions differ from the sklearn "
+                    "model; nothing was written."
+                )
+            self.stdout.write(
+                f"Verified {len(messages)} messages: predictions identical."
+            )
+
+        tmp_path = f"{output}.tmp"
+        joblib.dump(compiled, tmp_path, compress=0)
+        os.replace(tmp_path, output)
+
+        forest = compiled.forest
+        size = os.path.getsize(output) / (1024 * 1024)
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported {forest.n_estimators} trees, {len(forest.left)} nodes "
+            f"and {len(forest.used_features)} features to {output} "
+            f"({size:.1f} MiB)."
+        ))
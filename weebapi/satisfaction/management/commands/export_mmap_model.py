@@ -0,0 +1,55 @@
+import os
+
+import joblib
+from django.core.management.base import BaseCommand
+
+from satisfaction.satisfaction import (
+    MMAP_MODEL_PATH,
+    MODEL_PATH,
+    file_digest,
+)
+
+
+class Command(BaseCommand):
+    """
+    Export the sentiment model in a memory-mappable format.
+
+    Reads the model from `MODEL_PATH` and writes an uncompressed joblib
+    copy to `MMAP_MODEL_PATH`. Numpy arrays in an uncompressed joblib file
+    are stored raw, so `load_model()` can memory-map them read-only and
+    share them between worker processes.
+
+    The copy records the version of the model it was made from, and
+    `load_model()` ignores it once `sentiment_model.joblib` is replaced, so
+    run the command again every time the model changes
+    (`train_sentiment_models` does it).
+
+    Usage:
+        python manage.py export_mmap_model
+        python manage.py export_mmap_model --output /path/to/model.joblib
+    """
+
+    help = "Export the sentiment model as an uncompressed, mmap-able file."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=MMAP_MODEL_PATH,
+            help="Destination file (default: %(default)s).",
+        )
+
+    def handle(self, *args, **options):
+        output = options["output"]
+        model = joblib.load(MODEL_PATH)
+        model.source_version = file_digest([MODEL_PATH])
+
+        # Write to a temporary file first, so running workers that have the
+        # previous file mapped keep reading a consistent copy.
+        tmp_path = f"{output}.tmp"
+        joblib.dump(model, tmp_path, compress=0)
+        os.replace(tmp_path, output)
+
+        size = os.path.getsize(output) / (1024 * 1024)
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported {MODEL_PATH} to {output} ({size:.1f} MiB)."
+        ))
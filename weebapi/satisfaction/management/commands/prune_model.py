@@ -0,0 +1,131 @@
+import os
+import pickle
+import time
+
+import joblib
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from satisfaction.forest import synthetic_messages
+from satisfaction.pruning import prune_pipeline
+from satisfaction.satisfaction import MODEL_PATH
+from satisfaction.training import load_dataset
+
+
+class Command(BaseCommand):
+    """
+    Prune the sentiment model to the features its forest actually uses.
+
+    Builds a copy of the pipeline whose vectorizer only outputs the TF-IDF
+    features referenced by at least one split, with the trees renumbered
+    accordingly (see `prune_pipeline`). Predictions are checked to be
+    identical on synthetic messages (and on `--dataset`, if given) before
+    the pruned model is written, then the memory, load time and
+    per-message latency of both artifacts are reported.
+
+    The pruned file is a drop-in replacement: move it over
+    `sentiment_model.joblib` to use it.
+
+    Usage:
+        python manage.py prune_model
+        python manage.py prune_model --dataset twitter_training.csv
+    """
+
+    help = "Prune the TF-IDF vocabulary to the features used by the forest."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=os.path.join(os.path.dirname(MODEL_PATH),
+                                 "sentiment_model.pruned.joblib"),
+            help="Destination file (default: %(default)s).",
+        )
+        parser.add_argument(
+            "--dataset",
+            default=None,
+            help="CSV (training notes layout) whose messages are also used "
+                 "to check predictions.",
+        )
+        parser.add_argument(
+            "--verify",
+            type=int,
+            default=2000,
+            help="Number of synthetic messages used to check predictions "
+                 "(default: %(default)s).",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=200,
+            help="Single-message calls used to measure latency "
+                 "(default: %(default)s).",
+        )
+
+    def handle(self, *args, **options):
+        output = options["output"]
+        original = joblib.load(MODEL_PATH)
+        pruned = prune_pipeline(original)
+
+        vectorizer = original.steps[0][1]
+        messages = synthetic_messages(vectorizer, options["verify"])
+        if options["dataset"]:
+            messages += load_dataset(options["dataset"])[0]
+        if not np.array_equal(original.predict_proba(messages),
+                              pruned.predict_proba(messages)):
+            raise CommandError(
+                "Pruned model predictions differ from the original; "
+                "nothing was written."
+            )
+        self.stdout.write(
+            f"Verified {len(messages)} messages: predictions identical."
+        )
+
+        tmp_path = f"{output}.tmp"
+        joblib.dump(pruned, tmp_path)
+        os.replace(tmp_path, output)
+
+        used = pruned.steps[0][1].n_features
+        self.stdout.write(
+            f"Kept {used} of {len(vectorizer.idf_)} features "
+            f"({used / len(vectorizer.idf_):.1%})."
+        )
+
+        sample = messages[:options["repeat"]]
+        rows = []
+        for name, path, model in (("original", MODEL_PATH, original),
+                                  ("pruned", output, pruned)):
+            start = time.perf_counter()
+            joblib.load(path)
+            load_time = time.perf_counter() - start
+            rows.append((
+                name,
+                os.path.getsize(path),
+                len(pickle.dumps(model.steps[0][1], protocol=5)),
+                load_time,
+                self._p50(model.steps[0][1].transform, sample),
+                self._p50(model.predict, sample),
+            ))
+
+        self.stdout.write(
+            f"{'':9}{'file':>10}{'vectorizer':>12}{'load':>10}"
+            f"{'vectorize p50':>15}{'predict p50':>13}"
+        )
+        for name, size, vectorizer_size, load_time, vectorize, predict in rows:
+            self.stdout.write(
+                f"{name:9}{size / 2 ** 20:>8.1f}MB"
+                f"{vectorizer_size / 2 ** 20:>10.1f}MB"
+                f"{load_time * 1000:>8.0f}ms"
+                f"{vectorize * 1000:>13.3f}ms{predict * 1000:>11.3f}ms"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Pruned model saved as {output}"))
+
+    @staticmethod
+    def _p50(func, messages):
+        """Median latency of calling `func` on one message at a time."""
+        func(messages[:1])
+        timings = []
+        for message in messages:
+            start = time.perf_counter()
+            func([message])
+            timings.append(time.perf_counter() - start)
+        return float(np.median(timings))
@@ -0,0 +1,72 @@
+import joblib
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from sklearn.metrics import accuracy_score
+
+from satisfaction.satisfaction import LINEAR_MODEL_PATH, MODEL_PATH
+from satisfaction.training import (
+    build_forest_pipeline,
+    build_linear_pipeline,
+    load_dataset,
+    split_dataset,
+)
+
+
+class Command(BaseCommand):
+    """
+    Train and save the linear and Random Forest sentiment models.
+
+    Reproduces the training notes in `satisfaction.py`: the dataset is
+    filtered, split 80/20, and both pipelines are trained on the training
+    split and evaluated on the test split. The forest is written to
+    `MODEL_PATH` and the linear model, used by the cascade mode, to
+    `LINEAR_MODEL_PATH`.
+
+    When the forest is retrained, the memory-mapped and compiled copies
+    enabled by `SATISFACTION_MODEL_MMAP` / `SATISFACTION_FLAT_FOREST` are
+    exported again, since `load_model()` ignores copies of a previous
+    model.
+
+    Usage:
+        python manage.py train_sentiment_models twitter_training.csv
+        python manage.py train_sentiment_models data.csv --linear-only
+    """
+
+    help = "Train the linear and Random Forest sentiment models."
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", help="Path to the training CSV.")
+        parser.add_argument(
+            "--linear-only",
+            action="store_true",
+            help="Only train the linear model, keep the current forest.",
+        )
+
+    def handle(self, *args, **options):
+        messages, labels = load_dataset(options["dataset"])
+        X_train, X_test, y_train, y_test = split_dataset(messages, labels)
+        self.stdout.write(
+            f"Training set size: {len(X_train)}, "
+            f"test set size: {len(X_test)}"
+        )
+
+        models = [("Logistic Regression", build_linear_pipeline(),
+                   LINEAR_MODEL_PATH)]
+        if not options["linear_only"]:
+            models.append(("Random Forest", build_forest_pipeline(),
+                           MODEL_PATH))
+
+        for name, model, path in models:
+            model.fit(X_train, y_train)
+            accuracy = accuracy_score(y_test, model.predict(X_test))
+            joblib.dump(model, path)
+            self.stdout.write(self.style.SUCCESS(
+                f"{name}: accuracy {accuracy:.4f}, saved as {path}"
+            ))
+
+        if not options["linear_only"]:
+            if settings.SATISFACTION_MODEL_MMAP:
+                call_command("export_mmap_model", stdout=self.stdout)
+            if settings.SATISFACTION_FLAT_FOREST:
+                call_command("export_flat_forest", stdout=self.stdout)
@@ -0,0 +1,247 @@
+import multiprocessing
+import queue
+import threading
+import time
+
+import django
+
+
+# Batches smaller than this are never split across worker processes, since
+# the IPC round trip would cost more than the parallelism saves.
+MIN_CHUNK_SIZE = 32
+
+
+class PoolClosed(RuntimeError):
+    """Raised by `InferenceProcessPool.predict` once the pool is closed."""
+
+
+def _serve(conn, load_model):
+    """Main loop of an inference worker process.
+
+    Sets up Django, loads the model once, then answers the batches received
+    on `conn` until it receives None or the pipe is closed. Each reply is
+    `(labels, seconds)`, or `(exception, None)` if the model call failed.
+    """
+    try:
+        django.setup()
+        model = load_model()
+    except Exception as e:
+        # Report the failure to every caller instead of dying silently
+        model, error = None, e
+    else:
+        error = None
+    while True:
+        try:
+            messages = conn.recv()
+        except EOFError:
+            break
+        if messages is None:
+            break
+        if error is not None:
+            conn.send((error, None))
+            continue
+        started = time.perf_counter()
+        try:
+            labels = [str(label) for label in model.predict(messages)]
+        except Exception as e:
+            conn.send((e, None))
+        else:
+            conn.send((labels, time.perf_counter() - started))
+    conn.close()
+
+
+class _Worker:
+    """A worker process and the parent's end of its pipe."""
+
+    __slots__ = ("process", "conn")
+
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+
+    def stop(self):
+        """Ask the process to exit and release the pipe."""
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.conn.close()
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+
+
+class InferenceProcessPool:
+    """Long-lived worker processes running the sentiment model.
+
+    Tokenization and the forest run in pure Python under the GIL, so
+    threads cannot run model calls in parallel. Each worker of this pool is
+    a separate process that loads the model once at startup; a caller
+    borrows an idle worker, sends it the messages through a pipe and blocks
+    on the reply, which releases the GIL for the other threads. Up to
+    `processes` model calls thus run in parallel, one per core.
+
+    Batches of at least `2 * MIN_CHUNK_SIZE` messages are split across the
+    idle workers, so a single large request also uses several cores.
+
+    Workers are started with the "spawn" method and set up Django
+    themselves, so they do not inherit the parent's threads or database
+    connections. A worker that does not answer within `timeout` seconds is
+    killed and replaced.
+
+    Attributes:
+        processes (int): Number of worker processes.
+        load_model (callable): Function returning the model, called once in
+            each worker. Must be importable (e.g. a module-level function).
+        timeout (float): Seconds to wait for the reply to one batch,
+            including the model loading for the first one.
+    """
+
+    def __init__(self, processes, load_model, timeout=30.0):
+        self.processes = processes
+        self.load_model = load_model
+        self.timeout = timeout
+        self._context = multiprocessing.get_context("spawn")
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._closed = False
+        for _ in range(processes):
+            self._idle.put(self._start_worker())
+
+    def predict(self, messages):
+        """Run the model on `messages` in the worker processes.
+
+        Blocks until a worker is idle, and until all the labels are back.
+
+        Args:
+            messages (list[str]): Non-empty messages.
+
+        Returns:
+            tuple[list[str], float]: One label per message, in input order,
+            and the longest time spent in a model call, in seconds.
+
+        Raises:
+            PoolClosed: If the pool is closed, even while waiting for an
+                idle worker.
+            RuntimeError: If a worker process died during the call; it is
+                replaced.
+            TimeoutError: If a worker did not answer within `timeout`
+                seconds; it is killed and replaced.
+            Exception: Whatever the model raised in the worker.
+        """
+        if self._closed:
+            raise PoolClosed("The inference process pool is closed.")
+        workers = [self._borrow()]
+        wanted = min(self.processes, len(messages) // MIN_CHUNK_SIZE)
+        while len(workers) < wanted:
+            try:
+                workers.append(self._borrow(block=False))
+            except queue.Empty:
+                break
+
+        size = -(-len(messages) // len(workers))
+        chunks = [messages[i:i + size]
+                  for i in range(0, len(messages), size)]
+        labels = []
+        seconds = 0.0
+        error = None
+        died = RuntimeError("An inference worker process died.")
+        try:
+            sent = []
+            for i, chunk in enumerate(chunks):
+                try:
+                    workers[i].conn.send(chunk)
+                except OSError:
+                    workers[i] = self._replace(workers[i])
+                    error = error or died
+                else:
+                    sent.append(i)
+            for i in sent:
+                try:
+                    if not workers[i].conn.poll(self.timeout):
+                        workers[i] = self._replace(workers[i])
+                        error = error or TimeoutError(
+                            f"An inference worker process did not answer "
+                            f"within {self.timeout}s."
+                        )
+                        continue
+                    result, duration = workers[i].conn.recv()
+                except (EOFError, OSError):
+                    workers[i] = self._replace(workers[i])
+                    error = error or died
+                    continue
+                if duration is None:
+                    error = error or result
+                else:
+                    labels.extend(result)
+                    seconds = max(seconds, duration)
+        finally:
+            for worker in workers:
+                self._release(worker)
+        if error is not None:
+            raise error
+        return labels, seconds
+
+    def close(self):
+        """Stop the idle workers, and the busy ones once they are done.
+
+        Callers waiting for an idle worker get a `PoolClosed` error.
+        """
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if worker is not None:
+                worker.stop()
+        # Wakes up the callers blocked in `_borrow`, which leave it in place
+        # for the next one
+        self._idle.put(None)
+
+    def _start_worker(self):
+        """Start a worker process connected by a new pipe."""
+        conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_serve, args=(child_conn, self.load_model),
+            name="satisfaction-inference", daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        return _Worker(process, conn)
+
+    def _borrow(self, block=True):
+        """Take an idle worker, replacing it if it died while idle.
+
+        Raises:
+            PoolClosed: If the pool was closed.
+            queue.Empty: If `block` is False and no worker is idle (or the
+                pool was closed).
+        """
+        worker = self._idle.get(block=block)
+        if worker is None:
+            self._idle.put(None)
+            if not block:
+                raise queue.Empty
+            raise PoolClosed("The inference process pool is closed.")
+        if not worker.process.is_alive():
+            worker = self._replace(worker)
+        return worker
+
+    def _replace(self, worker):
+        """Discard a dead or stuck worker and start a new one in its
+        place."""
+        worker.conn.close()
+        if worker.process.is_alive():
+            worker.process.kill()
+        worker.process.join(timeout=1)
+        return self._start_worker()
+
+    def _release(self, worker):
+        """Give a worker back to the pool, or stop it if the pool closed."""
+        with self._lock:
+            if not self._closed:
+                self._idle.put(worker)
+                return
+        worker.stop()
@@ -0,0 +1,163 @@
+import copy
+import math
+from collections import Counter
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.base import clone
+from sklearn.pipeline import Pipeline
+from sklearn.tree._tree import Tree
+
+
+def forest_used_features(forest):
+    """Return the sorted feature indices referenced by a forest's splits.
+
+    Args:
+        forest (RandomForestClassifier): The fitted forest.
+
+    Returns:
+        ndarray: Sorted, unique feature indices.
+    """
+    return np.unique(np.concatenate([
+        estimator.tree_.feature[estimator.tree_.children_left != -1]
+        for estimator in forest.estimators_
+    ]))
+
+
+class PrunedTfidfVectorizer:
+    """TF-IDF vectorizer that only outputs the features a forest uses.
+
+    Produces exactly the columns `used_features` of the original
+    `TfidfVectorizer` output, renumbered `0..len(used_features) - 1`, with
+    bit-identical values.
+
+    The l2 normalization of a row depends on every in-vocabulary term of
+    the message, so unused terms cannot be dropped from the vocabulary:
+    they are still looked up, for their idf weight, but they never get an
+    output column. What is saved is the rest of the original vectorizer
+    (notably `stop_words_`, the set of every term cut by `max_features`),
+    the full-width sparse matrix and sklearn's per-call CSR processing.
+
+    Attributes:
+        analyzer_params (TfidfVectorizer): Unfitted copy of the original
+            vectorizer, only used to build the tokenizer.
+        vocabulary_ (dict[str, int]): Term to original column.
+        idf_ (ndarray): Idf weight of each original column.
+        columns (ndarray): Output column of each original column, or -1.
+    """
+
+    def __init__(self, vectorizer, used_features):
+        if (vectorizer.norm != "l2" or not vectorizer.use_idf
+                or vectorizer.binary or vectorizer.sublinear_tf):
+            raise ValueError(
+                "Only l2-normalized, non-binary, linear-tf TF-IDF "
+                "vectorizers can be pruned."
+            )
+        self.analyzer_params = clone(vectorizer)
+        self.vocabulary_ = dict(vectorizer.vocabulary_)
+        self.idf_ = np.asarray(vectorizer.idf_, dtype=np.float64)
+        self.columns = np.full(len(self.idf_), -1, dtype=np.intp)
+        self.columns[used_features] = np.arange(len(used_features))
+        self.n_features = len(used_features)
+        self._analyzer = None
+
+    def __getstate__(self):
+        """Do not pickle the analyzer, it is rebuilt on first use."""
+        state = self.__dict__.copy()
+        state["_analyzer"] = None
+        return state
+
+    def transform(self, messages):
+        """Vectorize raw messages into the pruned TF-IDF space.
+
+        Args:
+            messages (list[str]): The messages to vectorize.
+
+        Returns:
+            scipy.sparse.csr_matrix: Matrix of shape
+            (len(messages), n_features).
+        """
+        if self._analyzer is None:
+            self._analyzer = self.analyzer_params.build_analyzer()
+        vocabulary = self.vocabulary_
+        idf = self.idf_
+        columns = self.columns
+
+        indptr, indices, data = [0], [], []
+        for message in messages:
+            counts = Counter(
+                vocabulary[term] for term in self._analyzer(message)
+                if term in vocabulary
+            )
+            # Same operations, in the same (column) order, as
+            # CountVectorizer + TfidfTransformer + l2 normalize.
+            features = sorted(counts)
+            weights = [counts[feature] * idf[feature] for feature in features]
+            norm = 0.0
+            for weight in weights:
+                norm += weight * weight
+            norm = math.sqrt(norm)
+            for feature, weight in zip(features, weights):
+                column = columns[feature]
+                if column >= 0:
+                    indices.append(column)
+                    data.append(weight / norm)
+            indptr.append(len(indices))
+
+        return sp.csr_matrix(
+            (np.asarray(data, dtype=np.float64),
+             np.asarray(indices, dtype=np.int32),
+             np.asarray(indptr, dtype=np.int32)),
+            shape=(len(messages), self.n_features),
+        )
+
+    def fit_transform(self, messages, y=None):
+        """Alias of `transform`: a pruned vectorizer is already fitted."""
+        return self.transform(messages)
+
+
+def _remap_tree(tree, columns, n_features):
+    """Return a copy of an sklearn `Tree` with renumbered split features."""
+    _, (_, n_classes, n_outputs), state = tree.__reduce__()
+    nodes = state["nodes"].copy()
+    internal = nodes["left_child"] != -1
+    nodes["feature"][internal] = columns[nodes["feature"][internal]]
+    state = dict(state, nodes=nodes)
+    remapped = Tree(n_features, n_classes, n_outputs)
+    remapped.__setstate__(state)
+    return remapped
+
+
+def prune_pipeline(pipeline):
+    """Build a pruned copy of a TF-IDF + Random Forest pipeline.
+
+    The vectorizer is replaced by a `PrunedTfidfVectorizer` that only
+    outputs the features referenced by the forest, and every tree is
+    renumbered to read them. The pipeline object itself is not modified.
+
+    Args:
+        pipeline (Pipeline): The fitted pipeline.
+
+    Returns:
+        Pipeline: The pruned pipeline, with identical predictions.
+    """
+    (vectorizer_name, vectorizer), (forest_name, forest) = (
+        pipeline.steps[0], pipeline.steps[-1]
+    )
+    used = forest_used_features(forest)
+    pruned_vectorizer = PrunedTfidfVectorizer(vectorizer, used)
+    columns = pruned_vectorizer.columns
+
+    # Shallow copies share every fitted attribute with the original, only
+    # the trees and the expected number of features are replaced.
+    pruned_forest = copy.copy(forest)
+    pruned_forest.n_features_in_ = len(used)
+    pruned_forest.estimators_ = []
+    for estimator in forest.estimators_:
+        pruned = copy.copy(estimator)
+        pruned.n_features_in_ = len(used)
+        pruned.tree_ = _remap_tree(estimator.tree_, columns, len(used))
+        pruned_forest.estimators_.append(pruned)
+
+    return Pipeline(steps=[(vectorizer_name, pruned_vectorizer),
+                           (forest_name, pruned_forest)])
@@ -1,10 +1,322 @@
+import hashlib
+import logging
 import os
+import threading
+import time
+
 import joblib
+from django.conf import settings
+
+from core.metrics import (
+    CACHE_ENTRIES,
+    CACHE_LOOKUPS,
+    EXECUTOR_IN_FLIGHT,
+    EXECUTOR_QUEUE_DEPTH,
+    EXECUTOR_REJECTED,
+    MICRO_BATCH_QUEUE_DEPTH,
+    measure,
+    record_inference,
+)
+
+from .batching import BatchScheduler
+from .cache import ResultCache
+from .cascade import CascadeModel
+from .executor import InferenceExecutor
+from .pool import InferenceProcessPool
+
 
+logger = logging.getLogger(__name__)
 
 # Path to the pre-trained sentiment analysis model
 MODEL_PATH = os.path.join(os.path.dirname(__file__), "sentiment_model.joblib")
-_model = joblib.load(MODEL_PATH)
+# Uncompressed copy of the model whose numpy arrays can be memory-mapped,
+# created with `python manage.py export_mmap_model`
+MMAP_MODEL_PATH = os.path.join(os.path.dirname(__file__),
+                               "sentiment_model.mmap.joblib")
+# Same model with the forest compiled to flat node arrays, created with
+# `python manage.py export_flat_forest`
+FLAT_MODEL_PATH = os.path.join(os.path.dirname(__file__),
+                               "sentiment_model.flat.joblib")
+# TF-IDF + Logistic Regression model used by the cascade mode, created with
+# `python manage.py train_sentiment_models`
+LINEAR_MODEL_PATH = os.path.join(os.path.dirname(__file__),
+                                 "sentiment_linear.joblib")
+
+# The model is loaded on first use, so that importing this module (e.g.
+# from `contact.models` during `migrate`) does not pay for it.
+_model = None
+_model_lock = threading.Lock()
+_model_version = None
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+_cache = None
+_cache_lock = threading.Lock()
+_executor = None
+_executor_lock = threading.Lock()
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+
+def load_model():
+    """Load the sentiment model from disk.
+
+    When the `SATISFACTION_CASCADE` setting is enabled and the linear model
+    at `LINEAR_MODEL_PATH` exists, the forest is wrapped in a
+    `CascadeModel`: the linear model scores every message, and the forest
+    only scores messages whose probability falls inside
+    `SATISFACTION_CASCADE_BAND`.
+
+    Returns:
+        Pipeline | FlatForestPipeline | CascadeModel: The sentiment model.
+    """
+    forest = load_forest()
+    if settings.SATISFACTION_CASCADE and os.path.exists(LINEAR_MODEL_PATH):
+        low, high = settings.SATISFACTION_CASCADE_BAND
+        return CascadeModel(joblib.load(LINEAR_MODEL_PATH), forest, low, high)
+    return forest
+
+
+def load_forest():
+    """Load the TF-IDF + Random Forest model from disk.
+
+    When the `SATISFACTION_FLAT_FOREST` setting is enabled and the compiled
+    model at `FLAT_MODEL_PATH` exists, it is used instead of the sklearn
+    pipeline (see `FlatForestPipeline`).
+
+    When the `SATISFACTION_MODEL_MMAP` setting is enabled, the numpy arrays
+    of the compiled model, or of the uncompressed copy at `MMAP_MODEL_PATH`,
+    are memory-mapped read-only, so every worker process on the machine
+    shares the same pages instead of holding its own copy. Otherwise the
+    model is read from `MODEL_PATH`.
+
+    Exported copies record the version of the model they were made from
+    (`source_version`); a copy left over from a previous `MODEL_PATH` is
+    skipped with a warning, so that the model actually served always
+    matches `get_model_version()`.
+
+    Returns:
+        Pipeline | FlatForestPipeline: The TF-IDF + Random Forest model.
+    """
+    mmap_mode = "r" if settings.SATISFACTION_MODEL_MMAP else None
+    exports = []
+    if settings.SATISFACTION_FLAT_FOREST:
+        exports.append((FLAT_MODEL_PATH, "export_flat_forest"))
+    if mmap_mode:
+        exports.append((MMAP_MODEL_PATH, "export_mmap_model"))
+    exports = [export for export in exports if os.path.exists(export[0])]
+    if exports:
+        version = file_digest([MODEL_PATH])
+        for path, command in exports:
+            model = joblib.load(path, mmap_mode=mmap_mode)
+            if getattr(model, "source_version", None) == version:
+                return model
+            logger.warning(
+                "Ignoring %s: it was not exported from the current %s. "
+                "Run `python manage.py %s` again.",
+                path, MODEL_PATH, command,
+            )
+    return joblib.load(MODEL_PATH)
+
+
+def file_digest(paths) -> str:
+    """Return a short fingerprint of the content of files.
+
+    Args:
+        paths (list[str]): The files, hashed one after the other.
+
+    Returns:
+        str: The first 12 hex digits of the SHA-256 of the files.
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+def get_model():
+    """Return the process-wide sentiment model, loading it on first use.
+
+    Returns:
+        Pipeline | FlatForestPipeline | CascadeModel: The sentiment model.
+    """
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                _model = load_model()
+    return _model
+
+
+def get_model_version() -> str:
+    """Return a short fingerprint of the model files in use.
+
+    The fingerprint is a hash of `MODEL_PATH` (and of `LINEAR_MODEL_PATH`
+    in cascade mode). Compiled and memory-mapped copies give the same
+    predictions, so they share the version of the model they come from.
+    It is stored next to each computed score, so that contacts scored by
+    an older model can be found and rescored.
+
+    Returns:
+        str: The first 12 hex digits of the SHA-256 of the model files.
+    """
+    global _model_version
+    if _model_version is None:
+        paths = [MODEL_PATH]
+        if settings.SATISFACTION_CASCADE and os.path.exists(LINEAR_MODEL_PATH):
+            paths.append(LINEAR_MODEL_PATH)
+        _model_version = file_digest(paths)
+    return _model_version
+
+
+def get_cache() -> ResultCache:
+    """Return the process-wide prediction cache.
+
+    The cache is created on first use, with a size limit taken from the
+    `SATISFACTION_CACHE_SIZE` setting (0 disables it).
+
+    Like the model (and the worker processes of `get_process_pool`), it is
+    loaded once and kept for the life of the process: after the model files
+    are replaced, restart the server so that every process loads the new
+    model with an empty cache.
+
+    Returns:
+        ResultCache: The shared cache instance.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResultCache(settings.SATISFACTION_CACHE_SIZE)
+    return _cache
+
+
+def _cache_lookups() -> dict:
+    """Return the hit and miss counts of the prediction cache."""
+    if _cache is None:
+        return {("hit",): 0, ("miss",): 0}
+    stats = _cache.stats()
+    return {("hit",): stats["hits"], ("miss",): stats["misses"]}
+
+
+def _cache_entries() -> int:
+    """Return the number of predictions held in the cache."""
+    return 0 if _cache is None else _cache.stats()["size"]
+
+
+CACHE_LOOKUPS.set_function(_cache_lookups)
+CACHE_ENTRIES.set_function(_cache_entries)
+
+
+def get_scheduler() -> BatchScheduler:
+    """Return the process-wide micro-batching scheduler.
+
+    The scheduler is created on first use from the
+    `SATISFACTION_MICRO_BATCH_WAIT` and `SATISFACTION_MICRO_BATCH_MAX_SIZE`
+    settings.
+
+    Returns:
+        BatchScheduler: The shared scheduler instance.
+    """
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = BatchScheduler(
+                    _predict,
+                    max_wait=settings.SATISFACTION_MICRO_BATCH_WAIT,
+                    max_batch_size=settings.SATISFACTION_MICRO_BATCH_MAX_SIZE,
+                )
+    return _scheduler
+
+
+def _micro_batch_queue_depth() -> int:
+    """Return the number of messages waiting for a micro-batch."""
+    if _scheduler is None:
+        return 0
+    return _scheduler.metrics()["queue_depth"]
+
+
+MICRO_BATCH_QUEUE_DEPTH.set_function(_micro_batch_queue_depth)
+
+
+def get_executor() -> InferenceExecutor:
+    """Return the process-wide inference executor.
+
+    The executor is created on first use from the
+    `SATISFACTION_EXECUTOR_WORKERS` and `SATISFACTION_EXECUTOR_QUEUE_SIZE`
+    settings. It is used by the async satisfaction view, so that inference
+    never runs on the threads serving requests.
+
+    Returns:
+        InferenceExecutor: The shared executor instance.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = InferenceExecutor(
+                    workers=settings.SATISFACTION_EXECUTOR_WORKERS,
+                    queue_size=settings.SATISFACTION_EXECUTOR_QUEUE_SIZE,
+                )
+    return _executor
+
+
+def _executor_metric(name: str) -> int:
+    """Return one of the executor's `metrics()`, 0 until it is created."""
+    if _executor is None:
+        return 0
+    return _executor.metrics()[name]
+
+
+EXECUTOR_IN_FLIGHT.set_function(lambda: _executor_metric("in_flight"))
+EXECUTOR_QUEUE_DEPTH.set_function(lambda: _executor_metric("queue_depth"))
+EXECUTOR_REJECTED.set_function(lambda: _executor_metric("rejected"))
+
+
+def get_process_pool() -> InferenceProcessPool:
+    """Return the process-wide pool of inference worker processes.
+
+    The pool is started on first use with `SATISFACTION_INFERENCE_PROCESSES`
+    workers, each loading the model with `load_model`, and waits at most
+    `SATISFACTION_INFERENCE_TIMEOUT` seconds for each reply.
+
+    Returns:
+        InferenceProcessPool: The shared pool.
+    """
+    global _process_pool
+    if _process_pool is None:
+        with _process_pool_lock:
+            if _process_pool is None:
+                _process_pool = InferenceProcessPool(
+                    settings.SATISFACTION_INFERENCE_PROCESSES, load_model,
+                    timeout=settings.SATISFACTION_INFERENCE_TIMEOUT,
+                )
+    return _process_pool
+
+
+def _predict(messages: list[str]) -> list[str]:
+    """Run the model on non-empty messages, bypassing the cache.
+
+    The model runs in the calling thread, or in the worker processes of
+    `get_process_pool` when the `SATISFACTION_INFERENCE_BACKEND` setting is
+    "process".
+
+    Every call is recorded in the inference duration and batch size
+    histograms served on `/metrics`.
+    """
+    if settings.SATISFACTION_INFERENCE_BACKEND == "process":
+        labels, seconds = get_process_pool().predict(messages)
+        record_inference(seconds, len(messages))
+        return labels
+    model = get_model()
+    started = time.perf_counter()
+    # Predict sentiment from raw text (TF-IDF + Random Forest)
+    labels = list(model.predict(messages))
+    record_inference(time.perf_counter() - started, len(messages))
+    return labels
 
 
 def analyze_satisfaction(message: str) -> dict:
@@ -14,6 +326,16 @@ def analyze_satisfaction(message: str) -> dict:
     (TF-IDF + Random Forest) to predict whether the sentiment
     of a given message is positive or negative.
 
+    Predictions are cached by normalized message (see `ResultCache`), so
+    repeated messages do not go through the model again.
+
+    When the `SATISFACTION_MICRO_BATCHING` setting is enabled, the message
+    is handed to the shared `BatchScheduler`, which merges it with messages
+    from concurrent callers into a single model call.
+
+    The time spent, including cache lookups and waiting for a micro-batch,
+    is reported as the request's "inference" timing (see `core.metrics`).
+
     Args:
         message (str): The input text message to analyze.
 
@@ -26,11 +348,57 @@ def analyze_satisfaction(message: str) -> dict:
     if not message or not message.strip():
         return {"label": None, "proba": None}
 
-    # Predict sentiment from raw text (TF-IDF + Random Forest)
-    label = _model.predict([message])[0]
+    cache = get_cache()
+    with measure("inference", count=1):
+        label = cache.get(message)
+        if label is None:
+            if settings.SATISFACTION_MICRO_BATCHING:
+                label = get_scheduler().predict(message)
+            else:
+                label = _predict([message])[0]
+            cache.set(message, label)
     return {"label": label, "proba": None}
 
 
+def analyze_satisfaction_many(messages: list[str]) -> list[dict]:
+    """Analyze the sentiment of several messages in a single model call.
+
+    All non-empty messages that are not already cached are sent through
+    one `predict` call, which avoids paying the TF-IDF + Random Forest
+    overhead once per message. Empty or blank messages are handled like in
+    `analyze_satisfaction`, and the time spent is reported as in
+    `analyze_satisfaction`.
+
+    Args:
+        messages (list[str]): The input text messages to analyze.
+
+    Returns:
+        list[dict]: One result per input message, in the same order, each
+        with the same keys as `analyze_satisfaction`.
+    """
+    with measure("inference", count=len(messages)):
+        results = [{"label": None, "proba": None} for _ in messages]
+        cache = get_cache()
+        misses = []
+        for i, message in enumerate(messages):
+            if not message or not message.strip():
+                continue
+            label = cache.get(message)
+            if label is None:
+                misses.append(i)
+            else:
+                results[i]["label"] = label
+        if not misses:
+            return results
+
+        # Predict sentiment for every uncached message at once
+        labels = _predict([messages[i] for i in misses])
+        for i, label in zip(misses, labels):
+            results[i]["label"] = label
+            cache.set(messages[i], label)
+        return results
+
+
 def analyze_satisfaction_binary(message: str) -> int:
     """Analyze sentiment and return a binary label.
 
@@ -44,6 +412,62 @@ def analyze_satisfaction_binary(message: str) -> int:
     return 1 if result["label"] == "Positive" else 0
 
 
+def cached_satisfaction_binary(message: str) -> int | None:
+    """Return the binary label of a message if no model call is needed.
+
+    Empty messages and messages found in the prediction cache are answered
+    right away; the async view uses this to skip the inference executor.
+
+    Args:
+        message (str): The text to analyze.
+
+    Returns:
+        int | None: Like `analyze_satisfaction_binary`, or None if the
+        message has to go through the model.
+    """
+    if not message or not message.strip():
+        return 0
+    label = get_cache().get(message)
+    if label is None:
+        return None
+    return 1 if label == "Positive" else 0
+
+
+def predict_satisfaction_binary(message: str) -> int:
+    """Run the model on a message missed by `cached_satisfaction_binary`.
+
+    Goes through the micro-batching scheduler when it is enabled, and
+    caches the prediction, like `analyze_satisfaction`. Blocks for the
+    duration of the model call, so it is meant to run on the inference
+    executor.
+
+    Args:
+        message (str): A non-empty text to analyze.
+
+    Returns:
+        int: 1 if sentiment is positive, 0 otherwise.
+    """
+    if settings.SATISFACTION_MICRO_BATCHING:
+        label = get_scheduler().predict(message)
+    else:
+        label = _predict([message])[0]
+    get_cache().set(message, label)
+    return 1 if label == "Positive" else 0
+
+
+def analyze_satisfaction_binary_many(messages: list[str]) -> list[int]:
+    """Analyze sentiment of several messages and return binary labels.
+
+    Args:
+        messages (list[str]): The texts to analyze.
+
+    Returns:
+        list[int]: 1 for each positive message, 0 otherwise, in input order.
+    """
+    return [1 if result["label"] == "Positive" else 0
+            for result in analyze_satisfaction_many(messages)]
+
+
 """
 Model Training Notes
 --------------------
@@ -0,0 +1,67 @@
+import csv
+
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+
+
+def load_dataset(path):
+    """Load the Twitter entity sentiment dataset.
+
+    Follows steps 1 and 2 of the training notes in `satisfaction.py`: the
+    CSV has no header and four columns (ID, Entity, Sentiment, Content);
+    only rows labeled "Positive" or "Negative" with some content are kept.
+
+    Args:
+        path (str): Path to `twitter_training.csv` (or a file with the same
+            layout).
+
+    Returns:
+        tuple[list[str], list[str]]: The messages and their labels.
+    """
+    messages, labels = [], []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.reader(f):
+            if len(row) < 4:
+                continue
+            sentiment, content = row[2], row[3]
+            if sentiment in ("Positive", "Negative") and content:
+                messages.append(content)
+                labels.append(sentiment)
+    return messages, labels
+
+
+def split_dataset(messages, labels):
+    """Split the dataset like step 3 of the training notes.
+
+    Args:
+        messages (list[str]): The messages.
+        labels (list[str]): Their labels.
+
+    Returns:
+        tuple: `X_train, X_test, y_train, y_test`.
+    """
+    return train_test_split(
+        messages, labels, test_size=0.2, random_state=42, stratify=labels
+    )  # Stratify to preserve class ratio
+
+
+def build_linear_pipeline():
+    """Return the untrained TF-IDF + Logistic Regression pipeline."""
+    return Pipeline(steps=[
+        ("tfidf", TfidfVectorizer(max_features=100000, stop_words="english",
+                                  ngram_range=(1, 2))),
+        ("logreg", LogisticRegression(max_iter=1000)),
+    ])
+
+
+def build_forest_pipeline():
+    """Return the untrained TF-IDF + Random Forest pipeline."""
+    return Pipeline(steps=[
+        ("tfidf", TfidfVectorizer(max_features=100000, stop_words="english",
+                                  ngram_range=(1, 2))),
+        ("forest", RandomForestClassifier(n_estimators=200, random_state=42,
+                                          n_jobs=-1)),
+    ])
@@ -1,9 +1,18 @@
 # core/urls.py
+from django.conf import settings
 from django.urls import path
-from .views import SatisfactionAPIView
+from .views import (
+    AsyncSatisfactionView,
+    SatisfactionAPIView,
+    SatisfactionBatchAPIView,
+)
 
 urlpatterns = [
     path("satisfaction/",
-         SatisfactionAPIView.as_view(),
+         (AsyncSatisfactionView if settings.SATISFACTION_ASYNC_VIEW
+          else SatisfactionAPIView).as_view(),
          name="satisfaction"),
+    path("satisfaction/batch/",
+         SatisfactionBatchAPIView.as_view(),
+         name="satisfaction-batch"),
 ]
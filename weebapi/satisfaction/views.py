@@ -1,8 +1,25 @@
+import asyncio
+import json
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from django.conf import settings
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+
+from core.metrics import measure
 
-from .satisfaction import analyze_satisfaction_binary
+from .executor import ExecutorSaturated
+from .satisfaction import (
+    analyze_satisfaction_binary,
+    analyze_satisfaction_binary_many,
+    cached_satisfaction_binary,
+    get_executor,
+    predict_satisfaction_binary,
+)
 
 
 class SatisfactionAPIView(APIView):
@@ -58,3 +75,155 @@ class SatisfactionAPIView(APIView):
 
         result = analyze_satisfaction_binary(message)
         return Response({"satisfaction": result}, status=status.HTTP_200_OK)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncSatisfactionView(View):
+    """
+    Async-native version of `SatisfactionAPIView`, served under ASGI.
+
+    Same request and responses as `SatisfactionAPIView`, for JSON or form
+    bodies. Empty and cached messages are answered on the event loop; the
+    others are scored on the bounded inference executor (see
+    `get_executor`), so model calls never hold one of the threads that
+    serve the other endpoints.
+
+    When the executor already has `SATISFACTION_EXECUTOR_WORKERS +
+    SATISFACTION_EXECUTOR_QUEUE_SIZE` messages running or waiting, the
+    request is rejected instead of being queued:
+
+    Example saturation response:
+        HTTP 503 Service Unavailable
+        Retry-After: 1
+        {
+            "error": "Too many messages are being analyzed, retry later."
+        }
+    """
+
+    async def post(self, request):
+        """
+        Handle POST requests for sentiment analysis.
+
+        Args:
+            request (HttpRequest): The incoming HTTP request.
+
+        Returns:
+            JsonResponse: {"satisfaction": int} on success, or
+            {"error": str} on invalid input or saturation.
+        """
+        if request.content_type == "application/json":
+            try:
+                data = json.loads(request.body or b"{}")
+            except ValueError:
+                return JsonResponse({"error": "Invalid JSON body."},
+                                    status=status.HTTP_400_BAD_REQUEST)
+            if not isinstance(data, dict):
+                data = {}
+        else:
+            data = request.POST
+        message = data.get("message")
+
+        if message is None:
+            return JsonResponse(
+                {"error": "'message' field is required."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not isinstance(message, str):
+            return JsonResponse(
+                {"error": "'message' must be a string."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        result = cached_satisfaction_binary(message)
+        if result is None:
+            try:
+                future = get_executor().submit(predict_satisfaction_binary,
+                                               message)
+            except ExecutorSaturated:
+                return JsonResponse(
+                    {"error": "Too many messages are being analyzed, "
+                              "retry later."},
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    headers={
+                        "Retry-After": str(settings.SATISFACTION_RETRY_AFTER)
+                    },
+                )
+            with measure("inference", count=1):
+                result = await asyncio.wrap_future(future)
+        return JsonResponse({"satisfaction": result},
+                            status=status.HTTP_200_OK)
+
+
+class SatisfactionBatchAPIView(APIView):
+    """
+    API endpoint for analyzing the satisfaction of several messages at once.
+
+    Expects a POST request containing a 'messages' list in the JSON body.
+    All messages are scored with a single model call, and the scores are
+    returned in the same order as the input. Empty or blank messages are
+    scored as 0, like on the single-message endpoint.
+
+    The number of messages per request is limited by the
+    `SATISFACTION_BATCH_MAX_SIZE` setting.
+
+    Example request:
+        POST /api/satisfaction/batch/
+        {
+            "messages": ["Great service!", "Very disappointed."]
+        }
+
+    Example success response:
+        HTTP 200 OK
+        {
+            "satisfaction": [1, 0]
+        }
+
+    Example error response:
+        HTTP 400 Bad Request
+        {
+            "error": "'messages' must be a list of strings."
+        }
+    """
+
+    def post(self, request):
+        """
+        Handle POST requests for batch sentiment analysis.
+
+        Validates the input, checks the batch size limit, and uses
+        `analyze_satisfaction_binary_many()` to score all messages at once.
+
+        Args:
+            request (Request): The incoming HTTP request containing JSON data.
+
+        Returns:
+            Response: A JSON object containing either:
+                - {"satisfaction": list[int]} on success
+                - {"error": str} on invalid input
+        """
+        messages = request.data.get("messages")
+
+        if messages is None:
+            return Response(
+                {"error": "'messages' field is required."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if not isinstance(messages, list) or not all(
+            message is None or isinstance(message, str)
+            for message in messages
+        ):
+            return Response(
+                {"error": "'messages' must be a list of strings."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        max_size = settings.SATISFACTION_BATCH_MAX_SIZE
+        if len(messages) > max_size:
+            return Response(
+                {"error": f"'messages' cannot contain more than "
+                          f"{max_size} items."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        result = analyze_satisfaction_binary_many(messages)
+        return Response({"satisfaction": result}, status=status.HTTP_200_OK)